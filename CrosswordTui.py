@@ -1,4 +1,4 @@
-from crosswordEngine import crosswordEngine, parseLoc
+from crosswordEngine import BoardPool, parseLoc
 from typing import List, Union, Optional
 import itertools
 import curses
@@ -7,6 +7,7 @@ import threading
 import time
 import textwrap
 import sys
+import os
 
 import random
 
@@ -80,9 +81,10 @@ class _Utils:
         win.addstr(0, cw, f" {text.title()} ")
 
     def refresh(self, *windows) -> None:
-        self.scr.refresh()
+        self.scr.noutrefresh()
         for win in windows:
-            win.refresh()
+            win.noutrefresh()
+        curses.doupdate()
 
     def runtext(self, text: str, maxwidth: int = float("inf"), delimeter: str = " " * 10) -> iter:
         if len(text) < maxwidth:
@@ -126,14 +128,24 @@ class _Utils:
         return height - (ltexts // 2), width - (ltxt // 2), longestText if ltexts == 1 else texts
 
 class CrosswordTui(_Utils):
-    def __init__(self):
+    def __init__(self, dictionary: Optional[str] = None, *, cache: Optional[str] = None, seed: Optional[int] = None):
         self.question = "Lorem Ipsum adalah contoh teks atau dummy dalam industri percetakan dan penataan huruf atau typesetting. Lorem Ipsum telah menjadi standar contoh teks sejak tahun 1500an, saat seorang tukang cetak yang tidak dikenal mengambil sebuah kumpulan teks dan mengacaknya untuk menjadi sebuah buku contoh huruf. Ia tidak hanya bertahan selama 5 abad, tapi juga telah beralih ke penataan huruf elektronik, tanpa ada perubahan apapun. Ia mulai dipopulerkan pada tahun 1960 dengan diluncurkannya lembaran-lembaran Letraset yang menggunakan kalimat-kalimat dari Lorem Ipsum, dan seiring munculnya perangkat lunak Desktop Publishing seperti Aldus PageMaker juga memiliki versi Lorem Ipsum."
         self.score = float("inf")
         self.data = None
         self.activeThread = {}
+        # kamus kata (lihat crosswordDict), tanpa kamus kata dibuat acak
+        self.dictionary = dictionary
+        # cache susunan papan (lihat crosswordCache), dengan :seed: yang sama
+        # urutan papan selalu sama sehingga papan berikutnya diambil dari cache
+        self.cache = cache
+        self.seed = seed
+        # isi papan yang sedang tampil (lihat :self.drawCrossword:)
+        self.drawn = None
+        self.cursor = None
 
     def startWrapper(self):
-        curses.wrapper(self.app)
+        with BoardPool(dictionary=self.dictionary, cache=self.cache, seed=self.seed) as self.pool:
+            curses.wrapper(self.app)
 
     def endwin(self, msg: str):
         curses.endwin()
@@ -156,42 +168,95 @@ class CrosswordTui(_Utils):
         return _win
 
     def generateCrosswordBoard(self, mh: int, mw: int):
-        def targetFunc():
-            engine = crosswordEngine(
-                ["".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(
-                    random.randrange(2, 4))) for i in range(random.randrange(10, 50))],
-                maxheight=mh - 4, maxwidth=mw - 4)
-            engine.compute()
-            g = engine.generateBoard()
+        """Mengambil papan yang sudah disiapkan :self.pool: (lihat :BoardPool:) tanpa menunggu"""
+        if (board := self.pool.get()):
             self.data = {
-                "board": g.serialize(),
-                "clueless": g.serialize(g.clueless),
+                "clueless": ["".join(line) for line in board["clueless"]],
                 "height": mh,
                 "width": mw,
             }
-            self.parseLoc = parseLoc(g.board, g.new_position)
-            self.activeThread.pop("gcb")
-        self.startThread("gcb", targetFunc)
+            self.parseLoc = parseLoc(board["clueless"], board["new_position"])
 
     def drawCrossword(self, win: _curses.window, board: Optional[List] = None):
+        """
+           Papan hanya digambar ulang seluruhnya jika isinya berubah (papan
+           baru / sedang dibuat), perpindahan kursor cukup menggambar ulang
+           sel di sekitar kursor lama dan baru
+        """
         mh, mw = map(lambda x: x - 4, win.getmaxyx())
-        if not self.data:
-            self.generateCrosswordBoard(mh, mw)
-            self.data = None
+        # papan berikutnya disiapkan di background untuk ukuran sekarang
+        self.pool.resize(mh - 4, mw - 4)
         if self.data and (mh < self.data["height"] or mw < self.data["width"]):
             self.data = None
+        if not self.data:
+            self.generateCrosswordBoard(mh, mw)
 
-        if self.activeThread.get("gcb"):
-            win.addstr(2, 2, f"generating Crossword {mh} x {mw}")
-            win.refresh()
-        elif self.data:
-            ch, cw, board = self.calculateCenter(
-                board or self.data["clueless"], win)
-            for index, line in enumerate(board, start=ch):
-                win.addstr(index, cw, line)
-
-            for h, w, char in self.parseLoc.locaround:
+        # selama papan belum siap, tampilkan progress dari :BoardPool:
+        state = self.data
+        if not state:
+            state = f"generating Crossword {mh} x {mw}"
+            if (progress := self.pool.progress()):
+                state += " ({} kata, sisa {}, putaran {})".format(*progress)
+        if state != self.drawn:
+            win.erase()
+            win.border()
+            self.add_title("teka teki silang v1", win)
+            if not self.data:
+                win.addstr(2, 2, state[:mw])
+            else:
+                ch, cw, board = self.calculateCenter(
+                    board or self.data["clueless"], win)
+                for index, line in enumerate(board, start=ch):
+                    win.addstr(index, cw, line)
+                self.origin = (ch, cw)
+                self.cursor = None
+            self.drawn = state
+            win.noutrefresh()
+
+        if self.data and state is self.data and self.parseLoc.start != self.cursor:
+            ch, cw = self.origin
+            if self.cursor is not None:
+                for h, w, char in self.highlight:
+                    win.addstr(ch + h, cw + w, char)
+            self.cursor, self.highlight = self.parseLoc.start, self.parseLoc.locaround
+            for h, w, char in self.highlight:
                 win.addstr(ch + h, cw + w, char, curses.color_pair(2))
+            win.noutrefresh()
+
+    def drawQuestion(self, wraptext: Wraptext):
+        win = self.questBox
+        win.erase()
+        win.border()
+        self.add_title("question", win, "alignleft")
+        questWidth = win.getmaxyx()[1] - 4
+        wraptext.update(self.question, width=questWidth, maxline=win.getmaxyx()[0] - 2)
+        for index, line in enumerate(wraptext, start=1):
+            win.addstr(index, 2, line)
+        win.noutrefresh()
+
+    def drawScore(self, score: int):
+        win = self.scoreBox
+        win.erase()
+        win.border()
+        self.add_title("score", win, "alignleft")
+        win.addstr(*self.calculateCenter(
+             f"{score}", win), curses.color_pair(
+             random.randint(1, curses.COLORS)))
+        win.noutrefresh()
+
+    def layout(self):
+        """Membuat window, hanya dipanggil di awal dan ketika ukuran terminal berubah"""
+        self.checkSize()
+        self.size = height, width = self.scr.getmaxyx()
+        p15 = self.calcPercentage(15, height, minint=5, maxint=8)
+
+        self.scr.erase()
+        self.scr.noutrefresh()
+        self.questBox = self.new_window(p15, width - 15, 0, 0)
+        self.mainBox = self.new_window(height - p15, width, p15, 0)
+        self.scoreBox = self.new_window(p15, 15, 0, width - 15)
+        self.dirty = {"question", "score"}
+        self.drawn = None
 
     def app(self, scr):
         self.scr = scr
@@ -200,44 +265,35 @@ class CrosswordTui(_Utils):
         self.scr.timeout(200)
         curses.curs_set(0)
 
-        wraptext = None
+        wraptext = Wraptext()
+        self.layout()
 
         ch = 0
-        cp = 0
+        score = None
         while ch != 17: # ctrl + q
-            self.checkSize()
-            height, width = self.scr.getmaxyx()
-            p15 = self.calcPercentage(15, height, minint=5, maxint=8)
-
-            if not wraptext:
-                wraptext = Wraptext()
-            questBox = self.new_window(p15, width - 15, 0, 0)
-            self.add_title("question", questBox, "alignleft")
-            questWidth = questBox.getmaxyx()[1] - 4
-            wraptext.update(self.question, width=questWidth, maxline=p15 - 2)
-            for index, line in enumerate(wraptext, start=1):
-                questBox.addstr(index, 2, line)
-
-            mainBox = self.new_window(height - p15, width, p15, 0)
-            self.add_title("teka teki silang v1", mainBox)
-            self.drawCrossword(mainBox)
-
-            #  additional
-            scoreBox = self.new_window(p15, 15, 0, width - 15)
-            self.add_title("score", scoreBox, "alignleft")
-            scoreBox.addstr(*self.calculateCenter(
-                 f"{ch}", scoreBox), curses.color_pair(
-                 random.randint(1, curses.COLORS)))
-
-            self.refresh(scoreBox, questBox, mainBox)
+            if ch == curses.KEY_RESIZE or self.scr.getmaxyx() != self.size:
+                self.layout()
+
+            # hanya bagian yang berubah yang digambar ulang, lalu dikirim
+            # ke terminal sekaligus dengan :curses.doupdate:
+            if "question" in self.dirty:
+                self.drawQuestion(wraptext)
+            if "score" in self.dirty or ch != score:
+                self.drawScore(ch)
+                score = ch
+            self.dirty.clear()
+            self.drawCrossword(self.mainBox)
+            curses.doupdate()
 
             ch = self.scr.getch()
             if ch == 18: # ctrl + r
                 self.data = None
             elif ch == curses.KEY_PPAGE:
                 wraptext.back
+                self.dirty.add("question")
             elif ch == curses.KEY_NPAGE:
                 wraptext.next
+                self.dirty.add("question")
 
             elif ch == curses.KEY_UP:
                 self.parseLoc.moveUp()
@@ -248,5 +304,9 @@ class CrosswordTui(_Utils):
             elif ch == curses.KEY_RIGHT:
                 self.parseLoc.moveRight()
 
-tui = CrosswordTui()
-tui.startWrapper()
+if __name__ == "__main__":
+    seed = os.environ.get("CROSSWORD_SEED")
+    tui = CrosswordTui(sys.argv[1] if len(sys.argv) > 1 else None,
+                       cache=os.environ.get("CROSSWORD_CACHE"),
+                       seed=int(seed) if seed else None)
+    tui.startWrapper()
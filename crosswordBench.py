@@ -0,0 +1,229 @@
+"""
+   Benchmark untuk engine, renderer dan navigasi papan.
+
+   python crosswordBench.py                         # jalankan semua case
+   python crosswordBench.py --save baseline.json    # simpan hasil sebagai baseline
+   python crosswordBench.py --compare baseline.json # bandingkan dengan baseline
+"""
+from crosswordEngine import GridMaker, crosswordEngine, parseLoc
+import crosswordEngine as engineModule
+from typing import List, Optional
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import tabulate
+
+WORD_COUNTS = [10, 100, 1000, 5000]
+BOARD_SIZES = [(25, 60), (60, 200), (200, 600)]
+QUICK_WORD_COUNTS = [10, 100, 500]
+QUICK_BOARD_SIZES = [(25, 60), (60, 200)]
+
+# metrik yang nilainya lebih besar berarti lebih baik, sisanya lebih kecil lebih baik
+HIGHER_IS_BETTER = {"words_per_second", "placed"}
+
+
+def make_words(count: int, seed: int) -> List[str]:
+    rng = random.Random(f"{seed}:{count}")
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(
+        rng.randrange(2, 9))) for _ in range(count)]
+
+
+def timeit(func, repeat: int = 1) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build(words: List[str], size: tuple, seed: int) -> crosswordEngine:
+    engine = crosswordEngine(words, maxheight=size[0], maxwidth=size[1], seed=seed)
+    engine.compute()
+    return engine
+
+
+def bench_engine(words: List[str], size: tuple, seed: int, repeat: int) -> tuple:
+    engines = []
+    compute = timeit(lambda: engines.append(build(words, size, seed)), repeat)
+    engine = engines[-1]
+    placed = len(engine.word_used)
+
+    tracemalloc.start()
+    build(words, size, seed)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # panggil findPossibleDirection untuk setiap huruf kata pada posisi yang valid
+    calls = []
+    for word in sorted(engine.word_used)[:50]:
+        for char, positions in engine.find_position(word).items():
+            calls.extend((word, char, position) for position in positions)
+    def find_all():
+        for word, char, position in calls:
+            engine.findPossibleDirection(word, char, position)
+    find = timeit(find_all, repeat)
+
+    tracemalloc.start()
+    find_all()
+    find_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # semua posisi satu kata sekaligus, versi skalar dan numpy (jika ada)
+    locations = [(word, engine.find_position(word)) for word in sorted(engine.word_used)[:50]]
+    find_all = {}
+    for name, vectorize in (("find_all_scalar", False), ("find_all_numpy", True)):
+        if vectorize and engineModule.numpy is None:
+            continue
+        engine.vectorize = vectorize
+        find_all[name] = timeit(lambda: [engine.findAllDirections(word, location)
+                                         for word, location in locations], repeat) / len(locations)
+    engine.vectorize = None
+
+    return engine, {
+        **find_all,
+        "placed": placed,
+        "mask_skipped": engine.mask_skipped,
+        "compute": compute,
+        "words_per_second": placed / compute if compute else 0.0,
+        "peak_memory": peak,
+        "find_calls": len(calls),
+        "find_per_call": find / len(calls) if calls else 0.0,
+        "find_peak_memory": find_peak,
+    }
+
+
+def bench_render(engine: crosswordEngine, repeat: int) -> tuple:
+    gridMakers = []
+    def generate():
+        gridMakers.append(engine.generateBoard())
+    generate_time = timeit(generate, repeat)
+    gridMaker = gridMakers[-1]
+
+    tracemalloc.start()
+    engine.generateBoard()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    def generate_legacy():
+        GridMaker(engine.array, engine.registered).generate(legacy=True)
+
+    return gridMaker, {
+        "generate": generate_time,
+        "generate_legacy": timeit(generate_legacy, repeat),
+        "generate_clueless": timeit(lambda: engine.generateBoard(views=("clueless",)), repeat),
+        "serialize": timeit(gridMaker.serialize, repeat),
+        "serialize_clueless": timeit(lambda: gridMaker.serialize(gridMaker.clueless), repeat),
+        "render_peak_memory": peak,
+    }
+
+
+def bench_navigation(gridMaker, repeat: int, moves: int = 200) -> dict:
+    navigation = parseLoc(gridMaker.board, gridMaker.new_position)
+    result = {"parseLoc": timeit(
+        lambda: parseLoc(gridMaker.board, gridMaker.new_position), repeat)}
+    for name in ("moveLeft", "moveRight", "moveUp", "moveDown"):
+        move = getattr(navigation, name)
+        def run():
+            for _ in range(moves):
+                move()
+        result[name] = timeit(run, repeat) / moves
+    def around():
+        for _ in range(moves):
+            list(navigation.locaround)
+    result["locaround"] = timeit(around, repeat) / moves
+    return result
+
+
+def run(word_counts: List[int], sizes: List[tuple], *, seed: int = 0, repeat: int = 3) -> dict:
+    cases = {}
+    for count in word_counts:
+        words = make_words(count, seed)
+        for size in sizes:
+            name = f"{count}w-{size[0]}x{size[1]}"
+            print(f"• {name}", file=sys.stderr, flush=True)
+            engine, result = bench_engine(words, size, seed, repeat)
+            gridMaker, render = bench_render(engine, repeat)
+            result.update(render)
+            result.update(bench_navigation(gridMaker, repeat))
+            cases[name] = result
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "cases": cases,
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[tuple]:
+    """Mengembalikan list (case, metrik, baseline, sekarang, perubahan) yang lebih buruk dari :threshold:"""
+    regressions = []
+    for name, metrics in current["cases"].items():
+        if name not in baseline["cases"]:
+            continue
+        for metric, value in metrics.items():
+            base = baseline["cases"][name].get(metric)
+            if not base or metric in ("placed", "find_calls", "mask_skipped"):
+                continue
+            change = (value - base) / base
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append((name, metric, base, value, change))
+    return regressions
+
+
+def report(result: dict) -> str:
+    columns = ["placed", "mask_skipped", "compute", "words_per_second", "peak_memory", "find_per_call",
+               "find_all_scalar", "find_all_numpy",
+               "generate", "generate_legacy", "generate_clueless", "serialize", "moveRight", "locaround"]
+    rows = [[name] + [metrics.get(column) for column in columns]
+            for name, metrics in result["cases"].items()]
+    return tabulate.tabulate(rows, headers=["case"] + columns, floatfmt=".6g")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="crossword benchmark")
+    parser.add_argument("--quick", action="store_true", help="case lebih sedikit dan lebih kecil")
+    parser.add_argument("--words", type=int, nargs="+", help="jumlah kata per case")
+    parser.add_argument("--sizes", nargs="+", metavar="HxW", help="ukuran papan, contoh: 60x200")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", metavar="FILE", help="simpan hasil sebagai baseline JSON")
+    parser.add_argument("--compare", metavar="FILE", help="bandingkan dengan baseline JSON")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="batas regresi relatif (default: 0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    word_counts = args.words or (QUICK_WORD_COUNTS if args.quick else WORD_COUNTS)
+    sizes = [tuple(map(int, size.lower().split("x"))) for size in args.sizes] if args.sizes \
+        else (QUICK_BOARD_SIZES if args.quick else BOARD_SIZES)
+
+    result = run(word_counts, sizes, seed=args.seed, repeat=args.repeat)
+    print(report(result))
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(result, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(result, baseline, args.threshold)
+        for name, metric, base, value, change in regressions:
+            print(f"REGRESSION {name} {metric}: {base:.6g} -> {value:.6g} ({change:+.0%})")
+        if regressions:
+            return 1
+        print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+   Cache hasil generate (susunan papan) di disk menggunakan sqlite.
+
+   Setiap entri disimpan dengan key hash (lihat :layout_key:) dan isi JSON
+   yang dikompres zlib. Ukuran total dibatasi :maxbytes:, entri yang paling
+   lama tidak dipakai dihapus lebih dulu (LRU). sqlite memakai mode WAL jadi
+   aman dipakai bersamaan oleh beberapa proses (misal worker
+   :crosswordEngine.generate_many:), setiap proses membuka koneksi sendiri.
+"""
+from typing import Optional
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS layouts (
+    key TEXT PRIMARY KEY NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS layouts_used ON layouts (used);
+"""
+
+def layout_key(*parts) -> str:
+    """Hash sha256 dari :parts: (harus bisa diubah ke JSON)"""
+    data = json.dumps(parts, separators=(",", ":"), sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+class LayoutCache:
+    """
+       >>> cache = LayoutCache("layouts.sqlite", maxbytes=32 * 1024 * 1024)
+       >>> cache.put(key, {"array": [...], "registered": {...}})
+       >>> cache.get(key)
+    """
+    def __init__(self, path: str, *, maxbytes: int = 64 * 1024 * 1024, timeout: float = 30.0):
+        self.path = path
+        self.maxbytes = maxbytes
+        self.timeout = timeout
+        self._connection = None
+        self._pid = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # koneksi sqlite tidak boleh dipakai setelah fork, buat ulang per proses
+        if self._connection is None or self._pid != os.getpid():
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._connection, self._pid = connection, os.getpid()
+        return self._connection
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self.connection.execute("SELECT value FROM layouts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        self.connection.execute("UPDATE layouts SET used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, value: dict) -> None:
+        data = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 9)
+        if len(data) > self.maxbytes:
+            return
+        connection = self.connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("INSERT OR REPLACE INTO layouts VALUES (?, ?, ?, ?)",
+                               (key, data, len(data), time.time()))
+            # hapus entri yang paling lama tidak dipakai sampai ukuran cukup
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM layouts").fetchone()[0]
+            if total > self.maxbytes:
+                for old, size in connection.execute(
+                        "SELECT key, size FROM layouts ORDER BY used").fetchall():
+                    if total <= self.maxbytes:
+                        break
+                    connection.execute("DELETE FROM layouts WHERE key = ?", (old,))
+                    total -= size
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM layouts").fetchone()[0]
+
+    def size(self) -> int:
+        """Ukuran total (byte) isi cache"""
+        return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM layouts").fetchone()[0]
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM layouts")
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,211 @@
+"""
+   Kamus kata dalam format biner yang dibaca menggunakan mmap.
+
+   python crosswordDict.py words.txt words.idx        # buat index sekali
+   python crosswordDict.py words.idx --sample 50      # ambil 50 kata acak
+
+   File teks dibaca satu kali (satu kata per baris), kata disaring dengan
+   aturan yang sama seperti :crosswordEngine.normalize_words: lalu disimpan
+   per panjang kata, diurutkan, dan dikelompokkan per huruf pertama. Setiap
+   kata disimpan tanpa pemisah (lebar tetap per panjang kata), jadi kata ke-n
+   bisa dibaca langsung tanpa parsing.
+
+   format (little endian):
+     header  : magic "CWDX", versi, panjang maksimal, jumlah kata
+     tabel   : untuk setiap panjang 0..maks -> offset data (u64) dan
+               27 indeks awal per huruf pertama A..Z (u32, kumulatif)
+     data    : kata-kata per panjang, urut alfabet
+"""
+from typing import Dict, Iterator, List, Optional, Union
+import argparse
+import bisect
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+import tempfile
+
+MAGIC = b"CWDX"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+LETTERS = 26
+ENTRY = struct.Struct("<Q" + "I" * (LETTERS + 1))
+
+# sama dengan filter :crosswordEngine.normalize_words:
+WORD_PATTERN = re.compile(r"[a-zA-Z]{2,}")
+
+def read_words(lines: Iterator[str], *, minlen: int = 2, maxlen: Optional[int] = None) -> Dict[int, set]:
+    """Kata unik (huruf besar) per panjang dari :lines:, satu kata per baris"""
+    groups = {}
+    for line in lines:
+        word = line.strip()
+        if minlen <= len(word) <= (maxlen or len(word)) and WORD_PATTERN.fullmatch(word):
+            groups.setdefault(len(word), set()).add(word.upper())
+    return groups
+
+def build_index(source: Union[str, Iterator[str]], target: str, *, minlen: int = 2, maxlen: Optional[int] = None) -> int:
+    """
+       Membuat index biner :target: dari file teks :source: (atau iterator
+       baris). File ditulis ke file sementara (unik per pemanggilan) di
+       folder yang sama lalu diganti sekaligus.
+       Mengembalikan jumlah kata.
+    """
+    if isinstance(source, str):
+        with open(source, encoding="utf-8", errors="ignore") as file:
+            groups = read_words(file, minlen=minlen, maxlen=maxlen)
+    else:
+        groups = read_words(source, minlen=minlen, maxlen=maxlen)
+
+    longest = max(groups, default=0)
+    offset = HEADER.size + ENTRY.size * (longest + 1)
+    entries, blocks = [], []
+    for length in range(longest + 1):
+        words = sorted(groups.get(length, ()))
+        starts, index = [], 0
+        for letter in range(LETTERS):
+            starts.append(index)
+            char = chr(ord("A") + letter)
+            while index < len(words) and words[index][0] == char:
+                index += 1
+        starts.append(len(words))
+        entries.append(ENTRY.pack(offset, *starts))
+        block = "".join(words).encode("ascii")
+        blocks.append(block)
+        offset += len(block)
+
+    total = sum(len(words) for words in groups.values())
+    # nama file sementara unik, beberapa proses (misal worker :BoardPool:)
+    # bisa membuat index yang sama bersamaan
+    file = tempfile.NamedTemporaryFile(dir=os.path.dirname(os.path.abspath(target)),
+                                       prefix=f"{os.path.basename(target)}.", suffix=".tmp",
+                                       delete=False)
+    try:
+        with file:
+            file.write(HEADER.pack(MAGIC, VERSION, longest, total))
+            file.writelines(entries)
+            file.writelines(blocks)
+        # NamedTemporaryFile dibuat dengan mode 0600
+        os.chmod(file.name, 0o644)
+        os.replace(file.name, target)
+    except BaseException:
+        os.unlink(file.name)
+        raise
+    return total
+
+class WordIndex:
+    """
+       Membaca index hasil :build_index: menggunakan mmap, hanya tabel kecil di
+       awal file yang dibaca ketika dibuka.
+
+       >>> with WordIndex("words.idx") as index:
+       ...     index.sample(50, random.Random(1), maxlen=3)
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.maxlen, self.total = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path!r} bukan index kata versi {VERSION}")
+        self.offsets, self.starts = [], []
+        for length in range(self.maxlen + 1):
+            offset, *starts = ENTRY.unpack_from(self.data, HEADER.size + ENTRY.size * length)
+            self.offsets.append(offset)
+            self.starts.append(starts)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+    def count(self, length: int, letter: Optional[str] = None) -> int:
+        """Jumlah kata dengan panjang :length: (dan huruf pertama :letter:)"""
+        if not 0 <= length <= self.maxlen:
+            return 0
+        starts = self.starts[length]
+        if letter is None:
+            return starts[-1]
+        code = ord(letter.upper()) - ord("A")
+        return starts[code + 1] - starts[code]
+
+    def word(self, length: int, index: int) -> str:
+        """Kata ke-:index: (urut alfabet) dengan panjang :length:"""
+        start = self.offsets[length] + index * length
+        return self.data[start:start + length].decode("ascii")
+
+    def words(self, length: int, letter: Optional[str] = None) -> Iterator[str]:
+        """Semua kata dengan panjang :length: (dan huruf pertama :letter:)"""
+        if not 0 <= length <= self.maxlen:
+            return
+        starts = self.starts[length]
+        first, last = 0, starts[-1]
+        if letter is not None:
+            code = ord(letter.upper()) - ord("A")
+            first, last = starts[code], starts[code + 1]
+        for index in range(first, last):
+            yield self.word(length, index)
+
+    def sample(self, count: int, rng: Optional[random.Random] = None, *, minlen: int = 2, maxlen: Optional[int] = None) -> List[str]:
+        """
+           :count: kata acak (tanpa duplikat) dengan panjang :minlen: sampai
+           :maxlen:, setiap kata punya peluang yang sama
+        """
+        rng = rng or random.Random()
+        lengths = range(max(minlen, 0), min(maxlen or self.maxlen, self.maxlen) + 1)
+        cumulative, total = [], 0
+        for length in lengths:
+            total += self.count(length)
+            cumulative.append(total)
+        results = []
+        for index in rng.sample(range(total), min(count, total)):
+            position = bisect.bisect_right(cumulative, index)
+            length = lengths[position]
+            results.append(self.word(length, index - (cumulative[position - 1] if position else 0)))
+        return results
+
+def load(path: str, *, index: Optional[str] = None) -> WordIndex:
+    """
+       Membuka :path: sebagai :WordIndex:. Jika :path: adalah file teks,
+       index dibuat di :index: (default ``path + ".idx"``) ketika belum ada
+       atau lebih lama dari file teksnya.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(MAGIC)) == MAGIC:
+            return WordIndex(path)
+    index = index or f"{path}.idx"
+    if not os.path.exists(index) or os.path.getmtime(index) < os.path.getmtime(path):
+        build_index(path, index)
+    return WordIndex(index)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="crossword dictionary index")
+    parser.add_argument("source", help="file teks (satu kata per baris) atau index")
+    parser.add_argument("target", nargs="?", help="tulis index ke file ini")
+    parser.add_argument("--minlen", type=int, default=2)
+    parser.add_argument("--maxlen", type=int)
+    parser.add_argument("--sample", type=int, metavar="N", help="tampilkan N kata acak")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    if args.target:
+        total = build_index(args.source, args.target, minlen=args.minlen, maxlen=args.maxlen)
+        print(f"{total} kata ditulis ke {args.target}", file=sys.stderr)
+    if args.sample:
+        with load(args.target or args.source) as index:
+            print("\n".join(index.sample(args.sample, random.Random(args.seed),
+                                         minlen=args.minlen, maxlen=args.maxlen)))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
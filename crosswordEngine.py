@@ -2,52 +2,85 @@ from array import *
 import random
 import re
 import argparse
+import contextlib
 import copy
 import sys
-from typing import List, Optional, Union
+from typing import Callable, Iterator, List, Optional, Union
 import logging
 from argparse import Namespace
 import tabulate
 import itertools
 import functools
+import heapq
+import json
+import multiprocessing
+import os
+import queue
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+import crosswordCache
+import crosswordDict
+
+try:
+    import numpy
+except ImportError:  # evaluator numpy bersifat opsional, lihat :crosswordEngine.findAllDirections:
+    numpy = None
 
-from pprint import pprint
 logging.basicConfig(format="• %(message)s", level=logging.WARN)
 
 # decorator
 def changeCurrentPos(func):
     @functools.wraps(func)
     def wrapper(self):
-        row, col = func(self)
-        char = self.board[row][col]
-        self.start = (row, col)
+        self.start = func(self)
     return wrapper
 
 class parseLoc:
     def __init__(self, board: List[str], data: dict):
+        self.empty_char = " "
+        self.load(board, data)
+
+    def load(self, board: List[str], data: dict) -> None:
+        """
+           Memuat papan baru dan membuat tabel navigasi, sehingga
+           :self.moveLeft: dkk dan :self.locaround: cukup satu lookup.
+        """
         self.board = board
         self.data = data
-        self.empty_char = " "
+        # sel terisi diambil dari :data: (lihat :GridMaker.update_position:),
+        # jadi :board: juga bisa berupa papan tanpa jawaban (clueless)
+        self.cells = {tuple(loc) for words in data.values()
+                      for word in words.values() for loc in word["loc"]}
+
+        # sel terisi berikutnya untuk setiap arah, berputar ke sisi lain
+        # jika sudah di ujung baris/kolom
+        self.moves = {"left": {}, "right": {}, "up": {}, "down": {}}
+        rows, cols = {}, {}
+        for row, col in sorted(self.cells):
+            rows.setdefault(row, []).append(col)
+            cols.setdefault(col, []).append(row)
+        for row, line in rows.items():
+            for index, col in enumerate(line):
+                self.moves["left"][row, col] = (row, line[index - 1])
+                self.moves["right"][row, col] = (row, line[(index + 1) % len(line)])
+        for col, line in cols.items():
+            for index, row in enumerate(line):
+                self.moves["up"][row, col] = (line[index - 1], col)
+                self.moves["down"][row, col] = (line[(index + 1) % len(line)], col)
+
+        self.around = {cell: tuple(self._around(*cell)) for cell in self.cells}
         self.start = self._startPosition()
 
     def is_empty_char(self, char: str) -> Union[bool]:
         return char in (self.empty_char, self.empty_char * 3)
 
     def _startPosition(self):
-        for row in range(1, len(self.board), 2):
-            for col in range(1, len(self.board[row]), 2):
-                char = self.board[row][col]
-                if not self.is_empty_char(char):
-                    return (row, col)
-
-    @property
-    def loc(self):
-        row, col = self.start
-        return (row, col * 2)
+        if self.cells:
+            return min(self.cells)
 
-    @property
-    def locaround(self):
-        row, col = self.start
+    def _around(self, row: int, col: int):
         for nrow, ncol in [
             (row - 1, col - 1),
             (row - 1, col),
@@ -70,53 +103,36 @@ class parseLoc:
                 ncol = ncol * 2
             yield (nrow, ncol, char)
 
+    @property
+    def loc(self):
+        row, col = self.start
+        return (row, col * 2)
+
+    @property
+    def locaround(self) -> tuple:
+        """(row, col, char) garis di sekitar :self.start:, lihat :self.load:"""
+        return self.around[self.start]
+
     @changeCurrentPos
     def moveLeft(self):
-        row, col = self.start
-        while True:
-            if col == 1:
-                col = len(self.board[row]) - 2
-            else:
-                col -= 2
-            if not self.is_empty_char(char := self.board[row][col]):
-                return (row, col)
+        return self.moves["left"][self.start]
 
     @changeCurrentPos
     def moveRight(self):
-        row, col = self.start
-        while True:
-            if col == len(self.board[row]) - 2:
-                col = 1
-            else:
-                col += 2
-            if not self.is_empty_char(char := self.board[row][col]):
-                return (row, col)
+        return self.moves["right"][self.start]
 
     @changeCurrentPos
     def moveUp(self):
-        row, col = self.start
-        while True:
-            if row == 1:
-                row = len(self.board) - 2
-            else:
-                row -= 2
-            if not self.is_empty_char(self.board[row][col]):
-                return (row, col)
+        return self.moves["up"][self.start]
 
     @changeCurrentPos
     def moveDown(self):
-        row, col = self.start
-        while True:
-            if row == len(self.board) - 2:
-                row = 1
-            else:
-                row += 2
-            if not self.is_empty_char(self.board[row][col]):
-                return (row, col)
+        return self.moves["down"][self.start]
 
 class GridMaker(object):
     def __init__(self, array: List[list], current_position: dict):
-        assert len(array) > 0
+        # :array: boleh berupa iterator, khusus untuk :self.stream:
+        assert not isinstance(array, list) or len(array) > 0
         self.array = array
         self.current_position = current_position
         self.new_position = {"vertical": {}, "horizontal": {}}
@@ -137,6 +153,15 @@ class GridMaker(object):
 
         self.empty_char = " "
 
+        # glyph sudut/persimpangan berdasarkan 4 sel di sekitarnya, index
+        # tabel: kiri-atas << 3 | kanan-atas << 2 | kiri-bawah << 1 | kanan-bawah
+        self.junctions = [
+            self.empty_char, self.cornerA, self.cornerB, self.centerTop,
+            self.cornerC, self.centerLeft, self.cross, self.cross,
+            self.cornerD, self.cross, self.centerRight, self.cross,
+            self.centerBottom, self.cross, self.cross, self.cross,
+        ]
+
     def is_empty(self, arr: List[list]) -> Union[bool]:
         return len(arr) < 1
 
@@ -228,17 +253,108 @@ class GridMaker(object):
 
         self.board.extend(results.__dict__.values())
 
+    def occupied(self, array: List[str]) -> List[bool]:
+        """Sel terisi pada satu baris :self.array:, ditambah satu sel kosong di kiri dan kanan"""
+        return [False] + [not self.is_empty_char(char) for char in array] + [False]
+
+    def borderline(self, up: List[bool], down: List[bool], numbers: Optional[dict] = None) -> List[str]:
+        """
+           Baris garis di antara dua baris sel (lihat :self.occupied:), glyph
+           persimpangan diambil dari :self.junctions:. :numbers: nomor soal
+           per kolom (lihat :self.stream:)
+        """
+        empty3, lineH, junctions = self.empty_char * 3, self.lineH, self.junctions
+        line = [junctions[up[1] << 2 | down[1]]]
+        for col in range(1, len(up) - 1):
+            if up[col] or down[col]:
+                line.append(f"{{0:{lineH[0]}<3}}".format(numbers[col - 1])
+                            if numbers and col - 1 in numbers else lineH)
+            else:
+                line.append(empty3)
+            line.append(junctions[up[col] << 3 | up[col + 1] << 2 | down[col] << 1 | down[col + 1]])
+        return line
+
+    def cellline(self, array: List[str], occupied: List[bool], clueless: bool = False) -> List[str]:
+        """Baris huruf, :clueless: untuk papan tanpa jawaban"""
+        empty, empty3, lineV = self.empty_char, self.empty_char * 3, self.lineV
+        line = [lineV if occupied[1] else empty]
+        for col, char in enumerate(array, start=1):
+            line.append(f" {char} " if occupied[col] and not clueless else empty3)
+            line.append(lineV if occupied[col] or occupied[col + 1] else empty)
+        return line
+
+    def render(self, views: tuple = ("board", "clueless")) -> None:
+        """
+           Pengganti :self.parseline: + :self.joinlines:, setiap baris papan
+           langsung ditulis dalam satu kali jalan. Garis dan persimpangan
+           dihitung dari sel terisi di sekitarnya (lihat :self.junctions:)
+
+           :views: papan yang dibuat, "board" (dengan jawaban) dan/atau
+           "clueless" (tanpa jawaban). Baris garis dipakai bersama oleh kedua
+           papan, hanya baris huruf yang dibuat untuk masing-masing papan.
+        """
+        solution, clueless = "board" in views, "clueless" in views
+        board, cluelessBoard = [], []
+        up = [False] * (len(self.array[0]) + 2)
+        for array in self.array:
+            down = self.occupied(array)
+            line = self.borderline(up, down)
+            board.append(line)
+            cluelessBoard.append(line)
+            if solution:
+                board.append(self.cellline(array, down))
+            if clueless:
+                cluelessBoard.append(self.cellline(array, down, clueless=True))
+            up = down
+        line = self.borderline(up, [False] * len(up))
+        board.append(line)
+        cluelessBoard.append(line)
+        self.board = board if solution else None
+        self.clueless = cluelessBoard if clueless else None
+
+    def stream(self, view: str = "board") -> Iterator[str]:
+        """
+           Menghasilkan baris papan :view: ("board" atau "clueless") satu per
+           satu, sama dengan :self.serialize: setelah :self.generate:, tanpa
+           menyimpan seluruh papan. :self.array: boleh berupa iterator baris
+           (lihat :crosswordEngine.iterarray:), jadi memori yang dipakai
+           hanya beberapa baris ditambah nomor soal.
+        """
+        clueless = view == "clueless"
+        # nomor soal sesuai urutan :self.update_position:, per baris -> kolom
+        numbers = {}
+        number = self.number
+        for vertical, horizontal in itertools.zip_longest(self.current_position.vertical, self.current_position.horizontal):
+            for item in (vertical, horizontal):
+                if item:
+                    row, col = item[0]
+                    if col not in numbers.setdefault(row, {}):
+                        numbers[row][col] = number
+                        number += 1
+
+        up = None
+        for index, array in enumerate(self.array):
+            down = self.occupied(array)
+            yield "".join(self.borderline(up or [False] * len(down), down, numbers.get(index)))
+            yield "".join(self.cellline(array, down, clueless))
+            up = down
+        if up is not None:
+            yield "".join(self.borderline(up, [False] * len(up)))
+
     def update_position(self) -> None:
         def calc(pos: tuple) -> tuple:
             return tuple(map(lambda x: (x * 2) + 1, pos))
 
+        # baris garis dipakai bersama oleh :self.board: dan :self.clueless:
+        board = self.board if self.board is not None else self.clueless
+
         def add_number(pos: tuple) -> None:
             row, col = calc(pos)
-            char = self.board[row - 1][col]
+            char = board[row - 1][col]
             if char == self.lineH:
                 char = f"{{0:{self.lineH[0]}<3}}".format(self.number)
                 self.number += 1
-            self.board[row - 1][col] = char
+            board[row - 1][col] = char
             return re.search(r"(\d+)", char).group(1)
 
         for vertical, horizontal in itertools.zip_longest(self.current_position.vertical, self.current_position.horizontal):
@@ -263,61 +379,357 @@ class GridMaker(object):
             board.append([re.sub(r"[A-Z]", " ", char) for char in line])
         self.clueless = board
 
-    def generate(self) -> None:
-        for array in self.array:
-            self.parseline(array)
-        self.joinlines()
-        self.update_position()
-        self.genClueless()
+    def generate(self, *, legacy: bool = False, views: tuple = ("board", "clueless")) -> None:
+        """
+           :legacy: memakai :self.parseline: + :self.joinlines: (versi lama,
+           untuk perbandingan), :views: lihat :self.render:
+        """
+        if legacy:
+            for array in self.array:
+                self.parseline(array)
+            self.joinlines()
+            self.update_position()
+            self.genClueless()
+        else:
+            self.render(views)
+            self.update_position()
 
     def serialize(self, arrays: Optional[List[list]] = None) -> None:
         arrays = arrays or self.board
         return ["".join(i) for i in arrays]
 
+class Tracer:
+    """
+       Penghitung untuk memantau kerja engine, dipasang lewat
+       ``crosswordEngine(..., tracer=Tracer())``. Tanpa tracer engine tidak
+       membuat string/objek tambahan apapun di loop utama.
+
+       counters:
+         - candidates : split (sideA, sideB) yang dievaluasi
+         - rejected   : split yang tidak menghasilkan arah apapun
+         - crash_checks / crashes : sel samping terisi yang dicek crash oleh
+                          :findPossibleDirection: dan yang hasilnya crash
+         - placed / skipped : kata yang berhasil / gagal ditambahkan
+         - out_of_bounds : arah split yang ditolak karena melebihi
+                           :maxheight:/:maxwidth:
+         - mask_skipped : kata yang dilewati tanpa mencari posisi karena
+                          tidak punya huruf yang sama dengan papan
+         - optimize_moves / optimize_accepted : langkah :optimize: yang
+                          dicoba / disimpan
+       passes: jumlah kata yang ditambahkan dan dilewati per putaran :compute:
+    """
+    def __init__(self):
+        self.counters = Counter()
+        self.passes = []
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] += amount
+
+    def event(self, name: str, **fields) -> None:
+        """Detail kejadian (split, crash, hasil), diabaikan oleh tracer dasar"""
+
+    def record_pass(self, loop: int, placed: int, skipped: int) -> None:
+        self.passes.append({"loop": loop, "placed": placed, "skipped": skipped})
+
+    def report(self) -> str:
+        rows = sorted(self.counters.items())
+        rows += [(f"pass {item['loop']}", f"{item['placed']} ditambahkan, {item['skipped']} dilewati")
+                 for item in self.passes]
+        return tabulate.tabulate(rows, headers=["counter", "value"])
+
+class LoggingTracer(Tracer):
+    """Tracer yang juga menulis setiap kejadian ke ``logging.debug``"""
+    def event(self, name: str, **fields) -> None:
+        logging.debug("%s: %s", name, ", ".join(
+            f"{key}={value!r}" for key, value in fields.items()))
+
+class Placement:
+    """
+       Satu kemungkinan posisi kata hasil :crosswordEngine.findPossibleDirection:
+
+       :location: posisi huruf :char: yang sudah ada di papan, :sideA: dan
+       :sideB: potongan kata sebelum/sesudah :char:, :newA:/:newB: jumlah
+       baris atau kolom baru yang dibutuhkan di awal/akhir papan.
+    """
+    __slots__ = ("direction", "location", "char", "sideA", "sideB", "newA", "newB")
+
+    def __init__(self, direction: str, location: tuple, char: str, sideA: str, sideB: str, newA: int, newB: int):
+        self.direction = direction
+        self.location = location
+        self.char = char
+        self.sideA = sideA
+        self.sideB = sideB
+        self.newA = newA
+        self.newB = newB
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Placement) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        return "Placement({})".format(", ".join(
+            f"{name}={getattr(self, name)!r}" for name in self.__slots__))
+
+class Grid:
+    """
+       Isi papan dalam bytearray datar (baris demi baris) dengan koordinat
+       absolut. :cells: menyimpan kode ASCII huruf (0 berarti kosong) dan
+       :counts: jumlah kata yang melewati sel tersebut.
+
+       Kapasitas dibuat dua kali lipat ketika papan melewati batas, jadi
+       pertumbuhan tetap O(1) (amortized) dan koordinat lama tidak berubah.
+       Offset sel (row, col) adalah ``(row - row0) * stride + (col - col0)``.
+    """
+    __slots__ = ("cells", "counts", "stride", "height", "row0", "col0", "size")
+
+    def __init__(self, height: int = 16, width: int = 16, row0: int = -8, col0: int = -8):
+        self.cells = bytearray(height * width)
+        self.counts = bytearray(height * width)
+        self.stride = width
+        self.height = height
+        self.row0 = row0
+        self.col0 = col0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def contains(self, row: int, col: int) -> bool:
+        return 0 <= row - self.row0 < self.height and 0 <= col - self.col0 < self.stride
+
+    def offset(self, row: int, col: int) -> int:
+        return (row - self.row0) * self.stride + col - self.col0
+
+    def row(self, row: int, left: int, right: int) -> bytes:
+        start = self.offset(row, left)
+        return bytes(self.cells[start:start + right - left + 1])
+
+    def reserve(self, top: int, left: int, bottom: int, right: int) -> None:
+        """Memastikan area (top, left) - (bottom, right) muat di dalam kapasitas"""
+        if self.contains(top, left) and self.contains(bottom, right):
+            return
+
+        def grow(start: int, size: int, low: int, high: int) -> tuple:
+            end = start + size - 1
+            need = max(end, high) - min(start, low) + 1
+            if start <= low and high <= end:
+                return start, size
+            size = max(size * 2, need)
+            spare = size - need
+            if low < start and high > end:
+                return min(start, low) - spare // 2, size
+            if low < start:
+                return min(start, low) - spare, size
+            return start, size
+
+        row0, height = grow(self.row0, self.height, top, bottom)
+        col0, stride = grow(self.col0, self.stride, left, right)
+        cells, counts = bytearray(height * stride), bytearray(height * stride)
+        shift = (self.row0 - row0) * stride + self.col0 - col0
+        for row in range(self.height):
+            old, new = row * self.stride, row * stride + shift
+            cells[new:new + self.stride] = self.cells[old:old + self.stride]
+            counts[new:new + self.stride] = self.counts[old:old + self.stride]
+        self.cells, self.counts = cells, counts
+        self.row0, self.col0, self.height, self.stride = row0, col0, height, stride
+
+# luas papan minimal (tinggi x lebar) sebelum evaluator numpy dipakai secara otomatis
+VECTORIZE_MIN_AREA = 40 * 40
+
+# urutan huruf dari yang paling sering muncul sampai yang paling jarang
+LETTER_FREQUENCY = "ETAOINSHRDLCUMWFGYPBVKJXQZ"
+
+def by_length(word: str) -> int:
+    """Prioritas kata berdasarkan panjang kata (default)"""
+    return len(word)
+
+def by_rarity(word: str) -> int:
+    """
+       Prioritas kata berdasarkan huruf yang umum dipakai, kata dengan huruf
+       langka (Q, Z, X, ...) akan diproses belakangan
+    """
+    return sum(len(LETTER_FREQUENCY) - LETTER_FREQUENCY.find(char) for char in word)
+
+def letter_mask(word: str) -> int:
+    """Bitmask 26 bit huruf A-Z yang ada di :word: (bit 0 = A)"""
+    mask = 0
+    for char in word:
+        mask |= 1 << (ord(char) - 65)
+    return mask
+
+def normalize_words(words: List[str]) -> List[str]:
+    """
+       Filter kata menggunakan :regex:, kriteria kata yang kita butuhkan seperti ini;
+        - kata harus lebih dari 2 karakter
+        - karakter yang diperbolehkan hanya alfabet dari A sampai Z
+          huruf kecil juga termasuk
+       Kata dijadikan huruf besar dan duplikat dibuang tanpa mengubah urutan.
+    """
+    return list(dict.fromkeys(word.upper() for word in words if word and re.match(
+        r"^[a-zA-Z]{2,}$", word)))
+
+class WordQueue:
+    """
+       Antrian kata berdasarkan prioritas :key:, kata dengan nilai :key:
+       terbesar akan diambil terlebih dahulu. Kata dikelompokkan per nilai
+       :key: dan nilai :key: disimpan dalam heap, sehingga :push: dan :pop:
+       cukup O(log n) terhadap jumlah kelompok.
+    """
+    orderings = {"length": by_length, "rarity": by_rarity}
+
+    def __init__(self, words: List[str] = (), key: Union[str, Callable] = "length"):
+        self.key = self.orderings[key] if isinstance(key, str) else key
+        self.buckets = {}
+        self.heap = []
+        self.size = 0
+        self.extend(words)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.buckets.get(self.key(word), ())
+
+    def __iter__(self):
+        for priority in sorted(self.buckets, reverse=True):
+            yield from self.buckets[priority]
+
+    def push(self, word: str) -> None:
+        priority = self.key(word)
+        if (bucket := self.buckets.get(priority)) is None:
+            bucket = self.buckets[priority] = OrderedDict()
+            heapq.heappush(self.heap, -priority)
+        if word not in bucket:
+            bucket[word] = None
+            self.size += 1
+
+    def extend(self, words: List[str]) -> None:
+        for word in words:
+            self.push(word)
+
+    def remove(self, word: str) -> None:
+        priority = self.key(word)
+        del self.buckets[priority][word]
+        self.size -= 1
+        if not self.buckets[priority]:
+            # nilai di :self.heap: dibersihkan saat :self.peek: dipanggil
+            del self.buckets[priority]
+
+    def peek(self) -> str:
+        while self.heap:
+            if (bucket := self.buckets.get(-self.heap[0])):
+                return next(iter(bucket))
+            heapq.heappop(self.heap)
+        return ""
+
+    def pop(self) -> str:
+        if (word := self.peek()):
+            self.remove(word)
+        return word
+
 class crosswordEngine:
-    def __init__(self, words: List[str], *, maxloop: Optional[int] = 1, empty_cell: str = " ", maxheight: Optional[int] = None, maxwidth: Optional[int] = None):
+    def __init__(self, words: List[str], *, maxloop: Optional[int] = 1, empty_cell: str = " ", maxheight: Optional[int] = None, maxwidth: Optional[int] = None, order: Union[str, Callable] = "length", seed: Union[int, random.Random, None] = None, tracer: Optional[Tracer] = None, vectorize: Optional[bool] = None):
         assert len(words) > 0, "input 'kata' tidak boleh kosong"
 
+        # setiap engine memakai generator acak sendiri agar hasil bisa diulang
+        # dengan :seed: yang sama, termasuk ketika dijalankan paralel
+        self.random = seed if isinstance(seed, random.Random) else random.Random(seed)
+
+        # lihat :Tracer:, jika logging di level DEBUG detail kerja engine
+        # akan ditulis menggunakan :LoggingTracer:
+        if tracer is None and logging.getLogger().isEnabledFor(logging.DEBUG):
+            tracer = LoggingTracer()
+        self.tracer = tracer
+
+        # evaluator numpy (lihat :self.findAllDirections:), None berarti
+        # otomatis dipakai jika numpy tersedia dan papan cukup besar
+        assert not (vectorize and numpy is None), "vectorize membutuhkan numpy"
+        self.vectorize = vectorize
+
         self.direct = Namespace(up="UP", down="DOWN",
                                 left="LEFT", right="RIGHT")
 
-        # filter kata terlebih dahulu menggunakan :regex:
-        # kriteria kata yang kita butuhkan seperti ini;
-        #  - kata harus lebih dari 2 karakter
-        #  - karakter yang diperbolehkan hanya alfabet dari A sampai Z
-        #    huruf kecil juga termasuk
-        self.words = set(word.upper() for word in words if word and re.match(
-            r"^[a-zA-Z]{2,}$", word))
+        # filter kata terlebih dahulu, lihat :normalize_words:
+        # urutan pengambilan kata ditentukan oleh :order:, lihat :WordQueue:
+        self.order = order
+        self.words = WordQueue(normalize_words(words), key=order)
         self.word_used = set()
 
+        # bitmask huruf setiap kata (lihat :letter_mask:) dan huruf yang ada
+        # di papan, kata tanpa huruf yang sama langsung dilewati oleh
+        # :self.compute: tanpa :self.find_position:/:self.parsePos:
+        self.letter_masks = {word: letter_mask(word) for word in self.words}
+        self.letter_mask = 0
+        self.mask_skipped = 0
+
         # maksimal rekursif yang kita butuhkan, karena akan ada kondisi dimana
         # kata tidak bisa ditambahkan sebab belumb ada huruf dengan posisi yang
         # valid
         self.maxloop = maxloop
-        self.registered = Namespace(horizontal=[], vertical=[])
         self.empty_cell = empty_cell
 
+        # posisi kata disimpan dalam koordinat absolut, sehingga tidak perlu
+        # diperbaharui ketika papan bertambah ke atas/kiri. lihat :self.registered:
+        self.placements = Namespace(horizontal=[], vertical=[])
+
+        # isi papan disimpan dengan koordinat absolut (lihat :Grid:),
+        # :self.bounds: adalah bounding box yang sedang terpakai. lihat :self.array:
+        self.grid = Grid()
+        self.bounds = Namespace(top=0, left=0, bottom=0, right=0)
+
         self.maxheight = maxheight or float("inf")
         self.maxwidth = maxwidth or float("inf")
-        self.nonetype = type(None)
-        self.array = self.build_first_array()
-        logging.info(
-            f"generating crossword [{self.maxheight}, {self.maxwidth}]")
-        self.logging_level = logging.getLogger().level
+
+        # indeks huruf -> kumpulan posisi (row, col) di dalam :self.grid:,
+        # diperbaharui setiap kali huruf ditulis oleh :self.write_cell:
+        self.letter_index = {}
+
+        # jumlah kata menurun (per baris) / mendatar (per kolom) yang
+        # dilewati baris/kolom tersebut, lihat :self.crash_lines:
+        self.crash_index = Namespace(vertical={}, horizontal={})
+
+        self.build_first_array()
+        logging.info("generating crossword [%s, %s]", self.maxheight, self.maxwidth)
+
+    @property
+    def array(self) -> List[list]:
+        """Tampilan padat (list of list) dari :self.grid: sebesar :self.bounds:"""
+        return list(self.iterarray())
+
+    def iterarray(self) -> Iterator[list]:
+        """Baris :self.array: satu per satu tanpa membuat seluruh papan"""
+        for row in range(self.bounds.top, self.bounds.bottom + 1):
+            yield [chr(code) if code else self.empty_cell
+                   for code in self.grid.row(row, self.bounds.left, self.bounds.right)]
+
+    @property
+    def registered(self) -> Namespace:
+        """:self.placements: dengan posisi relatif terhadap :self.array:"""
+        top, left = self.bounds.top, self.bounds.left
+        return Namespace(**{
+            direction: [[(row - top, col - left), word]
+                        for (row, col), word in getattr(self.placements, direction)]
+            for direction in ("horizontal", "vertical")
+        })
+
+    @property
+    def height(self) -> int:
+        return self.bounds.bottom - self.bounds.top + 1
+
+    @property
+    def width(self) -> int:
+        return self.bounds.right - self.bounds.left + 1
 
     def longest_word(self, *,  delitem: bool = False) -> str:
         """
            Fungsi untuk mencari kata terpanjang dari list kata yang sudah kita filter sebelumnya.
            Ini sangat penting karena dengan kata paling panjang otomatis kemungkinan
            mencari huruf yang sama juga tinggi.
+           (atau kata dengan prioritas tertinggi jika :order: bukan "length")
         """
-        longest_word_ = ""
-        for word in self.words:
-            if len(word) >= len(longest_word_):
-                longest_word_ = word
-        if delitem and longest_word_:
-            self.words.remove(longest_word_)
-        return longest_word_
+        if delitem:
+            return self.words.pop()
+        return self.words.peek()
 
     def next_word(self, **kwargs) -> str:
         """Fungsi wrapper dari :self.longest_word:"""
@@ -342,13 +754,20 @@ class crosswordEngine:
 
         longest_word = self.longest_word(delitem=True)
         self.word_used.add(longest_word)
-        logging.info(f"kata dasar: {longest_word}")
-        if random.choice([self.direct.down, self.direct.right]) == self.direct.down:
-            self.registered.vertical.append([(0, 0), longest_word])
-            return [[char] for char in longest_word]
+        logging.info("kata dasar: %s", longest_word)
+        if self.random.choice([self.direct.down, self.direct.right]) == self.direct.down:
+            self.bounds.bottom = len(longest_word) - 1
+            self.grid.reserve(0, 0, self.bounds.bottom, 0)
+            self.register_word("vertical", (0, 0), longest_word)
+            for row, char in enumerate(longest_word):
+                self.write_cell(char, row, 0)
         else:
-            self.registered.horizontal.append([(0, 0), longest_word])
-            return [[char for char in longest_word]]
+            self.bounds.right = len(longest_word) - 1
+            self.grid.reserve(0, 0, 0, self.bounds.right)
+            self.register_word("horizontal", (0, 0), longest_word)
+            for col, char in enumerate(longest_word):
+                self.write_cell(char, 0, col)
+        return self.array
 
     def split_text(self, word: str, delimeter: str) -> List[tuple]:
         """
@@ -370,383 +789,1217 @@ class crosswordEngine:
                 n.append((x(splited[:i]), x(splited[i:])))
             return n
 
+    def write_cell(self, char: str, row: int, col: int) -> None:
+        """Menulis huruf ke :self.grid: dan mencatatnya di :self.letter_index:"""
+        offset = self.grid.offset(row, col)
+        if not self.grid.cells[offset]:
+            self.grid.size += 1
+        self.grid.cells[offset] = ord(char)
+        if (cells := self.letter_index.get(char)) is None:
+            cells = self.letter_index[char] = set()
+            self.letter_mask |= 1 << (ord(char) - 65)
+        cells.add((row, col))
+
+    def overlaps(self, word: str) -> bool:
+        """Apakah :word: punya huruf yang sama dengan huruf di papan"""
+        mask = self.letter_masks.get(word)
+        if mask is None:
+            mask = letter_mask(word)
+        return bool(mask & self.letter_mask)
+
     def find_position(self, word: str) -> dict:
-        """Fungsi untuk mencari posisi huruf yang sama dalam sebuah array"""
+        """
+           Fungsi untuk mencari posisi huruf yang sama dalam sebuah array.
+           Posisi diambil dari :self.letter_index: (satu lookup per huruf)
+           dan diurutkan sesuai urutan baris lalu kolom.
+        """
         dict = {}
         for char in word:
-            for col, arr in enumerate(self.array):
-                for row, ar in enumerate(arr):
-                    if char == ar and (col, row) not in dict.get(char, []):
-                        dict.setdefault(char, [])
-                        dict[char].append((col, row))
+            if char not in dict and (cells := self.letter_index.get(char)):
+                dict[char] = sorted(cells)
         return dict
 
-    def update_registered_position(self, direction: str, newA: int) -> None:
+    def crash_lines(self, start: int, length: int) -> set:
         """
-           Karena isi dari :self.array: selalu berubah-ubah maka kita
-           juga akan memperbaharui posisi dari kata yang sudah terdaftar
-           sebelumnya
+           Baris (untuk kata menurun) atau kolom (untuk kata mendatar) yang
+           tetangganya (-1/+1) berada di bagian dalam kata, tanpa ujung kata.
+           :self.findPossibleDirection: menganggap sel samping yang terisi
+           aman jika semua kata yang terdaftar melewati baris/kolom tersebut.
         """
-        for index, (vertical, horizontal) in enumerate(itertools.zip_longest(self.registered.vertical, self.registered.horizontal)):
-            if vertical:
-                (row, col), word = vertical
-                if direction == "vertical":
-                    row += newA
-                elif direction == "horizontal":
-                    col += newA
-                self.registered.vertical[index] = [(row, col), word]
-            if horizontal:
-                (row, col), word = horizontal
-                if direction == "vertical":
-                    row += newA
-                elif direction == "horizontal":
-                    col += newA
-                self.registered.horizontal[index] = [(row, col), word]
-
-    def addWord(self, data: Namespace) -> None:
+        return {index + step for index in range(start + 1, start + length - 1)
+                for step in (-1, 1)}
+
+    def word_cells(self, direction: str, position: tuple, word: str) -> List[tuple]:
+        """Daftar sel (koordinat absolut) yang ditempati oleh kata"""
+        row, col = position
+        if direction == "vertical":
+            return [(row + index, col) for index in range(len(word))]
+        return [(row, col + index) for index in range(len(word))]
+
+    def register_word(self, direction: str, position: tuple, word: str) -> None:
+        """Mendaftarkan kata kedalam :self.placements: dan :self.crash_index:"""
+        row, col = position
+        getattr(self.placements, direction).append([position, word])
+        counter = getattr(self.crash_index, direction)
+        start = row if direction == "vertical" else col
+        for index in self.crash_lines(start, len(word)):
+            counter[index] = counter.get(index, 0) + 1
+        for cell in self.word_cells(direction, position, word):
+            self.grid.counts[self.grid.offset(*cell)] += 1
+
+    def unregister_word(self, direction: str, position: tuple, word: str) -> None:
         """
-           Menambahkan kata kedalam :self.array: sesuai dengan :data:
-           yang diberikan
+           Kebalikan dari :self.register_word:, huruf yang tidak lagi dipakai
+           kata lain ikut dihapus dari :self.grid: dan :self.letter_index:
         """
+        row, col = position
+        getattr(self.placements, direction).remove([position, word])
+        counter = getattr(self.crash_index, direction)
+        start = row if direction == "vertical" else col
+        for index in self.crash_lines(start, len(word)):
+            counter[index] -= 1
+            if not counter[index]:
+                del counter[index]
+        grid = self.grid
+        for cell in self.word_cells(direction, position, word):
+            offset = grid.offset(*cell)
+            grid.counts[offset] -= 1
+            if not grid.counts[offset]:
+                char = chr(grid.cells[offset])
+                grid.cells[offset] = 0
+                grid.size -= 1
+                self.letter_index[char].discard(cell)
+                if not self.letter_index[char]:
+                    del self.letter_index[char]
+                    self.letter_mask &= ~(1 << (ord(char) - 65))
+
+    def update_bounds(self) -> None:
+        """Menghitung ulang :self.bounds: dari kata yang masih terdaftar"""
+        cells = [cell for direction in ("vertical", "horizontal")
+                 for position, word in getattr(self.placements, direction)
+                 for cell in (position, self.word_cells(direction, position, word)[-1])]
+        rows, cols = zip(*cells)
+        self.bounds = Namespace(top=min(rows), left=min(cols), bottom=max(rows), right=max(cols))
+
+    def placement(self, data: Namespace) -> tuple:
+        """(direction, posisi awal, kata) dari hasil :self.findPossibleDirection:"""
         row, col = data.location
         word = data.sideA + data.char + data.sideB
-        self.word_used.add(word)
+        if data.direction == "vertical":
+            return data.direction, (row - len(data.sideA), col), word
+        return data.direction, (row, col - len(data.sideA)), word
 
+    def fits(self, data: Namespace) -> bool:
+        """Cek apakah papan masih muat dalam :self.maxheight:/:self.maxwidth: setelah :data: ditambahkan"""
         #  cek tinggi array + grid harus kurang dari :self.maxheight:
-        def calcHeight():
-            return (len(self.array) + data.newA + data.newB) * 2 + 1
-
+        if data.direction == "vertical":
+            return (self.height + data.newA + data.newB) * 2 + 1 < self.maxheight
         #  dan lebar array + grid harus kurang dari :self.maxwidth:
-        def calcWidth():
-            return (len(self.array[0]) + data.newA + data.newB) * 4 + 1
-
-        template = Namespace(word=data.sideA + data.char +
-                             data.sideB, row=row, col=col, cross=False)
-        if calcHeight() < self.maxheight and data.direction == "vertical":
-            self.registered.vertical.append(
-                [(row - len(data.sideA), col), word]
-            )
-            row += data.newA
-            if data.sideA:
-                for _ in range(data.newA):
-                    self.array.insert(0, [self.empty_cell]
-                                      * len(self.array[0]))
-                for num in range(1, len(data.sideA) + 1):
-                    charA = data.sideA[-num]
-                    self.array[row - num][col] = charA
-            if data.sideB:
-                for _ in range(data.newB):
-                    self.array.append([self.empty_cell] * len(self.array[0]))
-                for num, charA in enumerate(data.sideB, start=1):
-                    self.array[row + num][col] = charA
-
-        elif calcWidth() < self.maxwidth and data.direction == "horizontal":
-            self.registered.horizontal.append(
-                [(row, col - len(data.sideA)), word]
-            )
-            col += data.newA
-            for n in range(len(self.array)):
-                for _ in range(data.newA):
-                    self.array[n].insert(0, self.empty_cell)
-                for _ in range(data.newB):
-                    self.array[n].append(self.empty_cell)
-            if data.sideA:
-                for num in range(1, len(data.sideA) + 1):
-                    charB = data.sideA[-num]
-                    self.array[row][col - num] = charB
-            if data.sideB:
-                for num, charB in enumerate(data.sideB, start=1):
-                    self.array[row][col + num] = charB
-        else:
+        return (self.width + data.newA + data.newB) * 4 + 1 < self.maxwidth
+
+    def addWord(self, data: Namespace) -> None:
+        """
+           Menambahkan kata kedalam :self.grid: sesuai dengan :data:
+           yang diberikan. Posisi pada :data: memakai koordinat absolut,
+           jadi papan cukup diperbesar dengan menggeser :self.bounds:
+        """
+        row, col = data.location
+        direction, position, word = self.placement(data)
+        if not self.fits(data):
             return False
-        self.update_registered_position(data.direction, data.newA)
-        return True
+        self.word_used.add(word)
+        if direction == "vertical":
+            self.bounds.top -= data.newA
+            self.bounds.bottom += data.newB
+            self.grid.reserve(self.bounds.top, col, self.bounds.bottom, col)
+            self.register_word(direction, position, word)
+            for num in range(1, len(data.sideA) + 1):
+                self.write_cell(data.sideA[-num], row - num, col)
+            for num, charA in enumerate(data.sideB, start=1):
+                self.write_cell(charA, row + num, col)
 
-    def checkLines(self, l: List[int], direction: str) -> Optional[bool]:
-        maxcon = [(c, len(list(nl))) for c, nl in itertools.groupby(l)]
-        for i, (x, y) in enumerate(maxcon):
-            if (i == 0 and x == 0) or isinstance(x, self.nonetype) or (x == 0 and y > 1):
-                return False
+        else:
+            self.bounds.left -= data.newA
+            self.bounds.right += data.newB
+            self.grid.reserve(row, self.bounds.left, row, self.bounds.right)
+            self.register_word(direction, position, word)
+            for num in range(1, len(data.sideA) + 1):
+                self.write_cell(data.sideA[-num], row, col - num)
+            for num, charB in enumerate(data.sideB, start=1):
+                self.write_cell(charB, row, col + num)
         return True
 
-    def isCellCrash(self, current_position: tuple, real_direction: str) -> Optional[bool]:
-        def verify(row: int, col: int) -> Optional[bool]:
-            cpositions = {
-                "cur": (row, col),
-                "up": (row - 1, col), "down": (row + 1, col),
-                "left": (row, col - 1), "right": (row, col + 1),
-            }
-            return current_position in cpositions.values()
-
-        def translate(current_position: Union[tuple, List], real_direction: str) -> tuple:
-            row, col = current_position
-            if real_direction in ("up.left", "down.left"):
-                col += 1
-            elif real_direction in ("up.right", "down.right"):
-                col -= 1
-            elif real_direction in ("left.up", "right.up"):
-                row += 1
-            elif real_direction in ("left.down", "right.down"):
-                row -= 1
-            return (row, col)
-
-        currow, curcol = current_position
-        rrow, rcol = translate(current_position, real_direction)
-
-        for vertical, horizontal in itertools.zip_longest(self.registered.vertical, self.registered.horizontal):
-            if vertical:
-                (row, col), word = vertical
-                lword = len(word) - 1
-                if (verify(rrow, rcol) or verify(rrow + lword, rcol)):
-                    if not any(i in range(row + 1, row + lword) for i in [rrow - 1, rrow + 1]):
-                        logging.debug(
-                            f"crash on position: ({rrow}, {rcol}), HORIZONTAL.{real_direction}")
-                        return None
+    def placeWord(self, direction: str, position: tuple, word: str) -> None:
+        """
+           Menempatkan kata langsung pada posisi absolut (tanpa cek aturan),
+           dipakai untuk mengembalikan kata yang dihapus :self.removeWord:
+        """
+        (top, left), (bottom, right) = position, self.word_cells(direction, position, word)[-1]
+        bounds = self.bounds
+        bounds.top, bounds.left = min(bounds.top, top), min(bounds.left, left)
+        bounds.bottom, bounds.right = max(bounds.bottom, bottom), max(bounds.right, right)
+        self.grid.reserve(top, left, bottom, right)
+        self.register_word(direction, position, word)
+        for cell, char in zip(self.word_cells(direction, position, word), word):
+            self.write_cell(char, *cell)
+        self.word_used.add(word)
 
-            if horizontal:
-                (row, col), word = horizontal
-                lword = len(word) - 1
-                if (verify(rrow, rcol) or verify(rrow, rcol + lword)):
-                    if not any(i in range(col + 1, col + lword) for i in [rcol - 1, rcol + 1]):
-                        logging.debug(
-                            f"crash on position: ({rrow}, {rcol}), VERTICAL.{real_direction}")
-                        return None
-
-        return 0 if self.array[currow][curcol] != self.empty_cell else 1
-
-    def checkSide(self, row: int, col: int, real_direction: str) -> Optional[int]:
-        if self.array[row][col] == self.empty_cell:
-            return 1
-        return self.isCellCrash((row, col), real_direction)
-
-    def findPossibleDirection(self, word: str, char: str, location: tuple) -> Optional[str]:
+    def removeWord(self, data: Namespace) -> None:
+        """
+           Kebalikan dari :self.addWord:, menghapus kata dari papan.
+           :self.bounds: hanya dihitung ulang jika kata berada di tepi papan
+        """
+        direction, position, word = self.placement(data)
+        self.unregister_word(direction, position, word)
+        self.word_used.discard(word)
+        (top, left), (bottom, right) = position, self.word_cells(direction, position, word)[-1]
+        if top == self.bounds.top or left == self.bounds.left or \
+           bottom == self.bounds.bottom or right == self.bounds.right:
+            self.update_bounds()
+
+    def findPossibleDirection(self, word: str, char: str, location: tuple) -> List[Placement]:
+        """
+           Mencari posisi (mendatar/menurun) untuk :word: yang melewati huruf
+           :char: di :location:. Langsung membaca :self.grid: tanpa membuat
+           list/objek per sel.
+
+           Sel samping yang terisi dianggap crash jika ada kata terdaftar
+           yang bagian dalamnya tidak melewati baris/kolom sel kata di
+           sebelahnya (lihat :self.crash_lines:), dicek lewat
+           :self.crash_index: sehingga biayanya tetap O(1).
+        """
         splited_text = self.split_text(word, char)
         row, col = location
+        top, left, bottom, right = (self.bounds.top, self.bounds.left,
+                                    self.bounds.bottom, self.bounds.right)
+        tracer = self.tracer
+        grid = self.grid
+        cells, stride = grid.cells, grid.stride
+        anchor = grid.offset(row, col)
+
+        # cek crash untuk sel di garis menurun (kolom :col:) dan
+        # garis mendatar (baris :row:) memakai hitungan dari :self.crash_index:
+        vertical, horizontal = self.crash_index.vertical, self.crash_index.horizontal
+        nvertical, nhorizontal = len(self.placements.vertical), len(self.placements.horizontal)
+        vcrash = horizontal.get(col, 0) != nhorizontal
+        hcrash = vertical.get(row, 0) != nvertical
 
         results = []
 
-        # 1 artinya sel sudah ditempati
-        # 0 berarti belum ditempati alias masih kosong
-        lines = Namespace(
-            up=Namespace(left=[], right=[]),
-            down=Namespace(left=[], right=[]),
-            left=Namespace(up=[], down=[]),
-            right=Namespace(up=[], down=[]),
-        )
+        # status setiap garis di samping kata (tidak boleh diawali sel terisi,
+        #  berisi sel crash atau dua sel terisi berturut-turut):
+        #  -1 garis tidak valid, 0 sel terakhir sudah ditempati (atau garis
+        #  masih kosong), 1 sel terakhir masih kosong. status terus berlanjut
+        #  untuk setiap split yang muat (lihat step 0), sama seperti sebelumnya
+        ul = ur = dl = dr = lu = ld = ru = rd = 0
+        # sel samping terisi yang dicek crash, lihat :Tracer:
+        checks = crashed = 0
+        height, width = bottom - top + 1, right - left + 1
+        maxheight, maxwidth = self.maxheight, self.maxwidth
 
         # mulai mengecek satu persatu
         for sideA, sideB in splited_text:
-            local_direct = Namespace(
-                up=False, down=False, left=False, right=False)
-
-            # step 1: cek line dan sisi kiri/kanan jika
-            logging.debug(f"\n{sideA  = }")
-            for num in range(1, len(sideA) + 1):
-                if not isinstance(local_direct.up, self.nonetype):
-                    if row - num < 0:
-                        if not isinstance(local_direct.up, int):
-                            local_direct.up = 0
-                        local_direct.up += 1
-                    else:
-                        previous_char = self.array[row - num][col]
-                        if previous_char not in (self.empty_cell, sideA[-num]):
-                            local_direct.up = None
-
-                if not isinstance(local_direct.left, self.nonetype):
-                    if col - num < 0:
-                        if not isinstance(local_direct.left, int):
-                            local_direct.left = 0
-                        local_direct.left += 1
-                    else:
-                        previous_char = self.array[row][col - num]
-                        if previous_char not in (self.empty_cell, sideA[-num]):
-                            local_direct.left = None
-
-                if row - num >= 0:
-                    lines.up.left.append(self.checkSide(row - num, col - 1, "up.left")
-                                         if col - 1 >= 0 else 1)
-                    lines.up.right.append(self.checkSide(row - num, col + 1, "up.right")
-                                          if col + 1 < len(self.array[row]) else 1)
-                if col - num >= 0:
-                    lines.left.up.append(self.checkSide(row - 1, col - num, "left.up")
-                                         if row - 1 >= 0 else 1)
-                    lines.left.down.append(self.checkSide(row + 1, col - num, "left.down")
-                                           if row + 1 < len(self.array) else 1)
-
-            logging.debug(f"{location} = {char}")
-            logging.debug(f"{sideB  = }")
-
-            for num, charB in enumerate(sideB, start=1):
-                if not isinstance(local_direct.down, self.nonetype):
-                    if row + num >= len(self.array):
-                        if not isinstance(local_direct.down, int):
-                            local_direct.down = 0
-                        local_direct.down += 1
-                    else:
-                        next_char = self.array[row + num][col]
-                        if next_char not in (self.empty_cell, charB):
-                            local_direct.down = None
-
-                if not isinstance(local_direct.right, self.nonetype):
-                    if col + num >= len(self.array[row]):
-                        if not isinstance(local_direct.right, int):
-                            local_direct.right = 0
-                        local_direct.right += 1
-                    else:
-                        next_char = self.array[row][col + num]
-                        if next_char not in (self.empty_cell, charB):
-                            local_direct.right = None
-
-                if row + num < len(self.array):
-                    lines.down.left.append(self.checkSide(row + num, col - 1, "down.left")
-                                           if col - 1 >= 0 else 1)
-                    lines.down.right.append(self.checkSide(row + num, col + 1, "down.right")
-                                            if col + 1 < len(self.array[row]) else 1)
-                if col + num < len(self.array[row]):
-                    lines.right.up.append(self.checkSide(row - 1, col + num, "right.up")
-                                          if row - 1 >= 0 else 1)
-                    lines.right.down.append(self.checkSide(row + 1, col + num, "right.down")
-                                            if row + 1 < len(self.array) else 1)
-
-            logging.debug(f"{lines.up = }")
-            logging.debug(f"{lines.left = }")
-            logging.debug(f"{lines.down = }")
-            logging.debug(f"{lines.right = }")
-
-            # step 2: ubah value
-            if local_direct.left is False and col - len(sideA) >= 0:
-                local_direct.left = 0
-            if local_direct.up is False and row - len(sideA) >= 0:
-                local_direct.up = 0
-            if local_direct.right is False and col + len(sideB) < len(self.array[row]):
-                local_direct.right = 0
-            if local_direct.down is False and row + len(sideB) < len(self.array):
-                local_direct.down = 0
-
-            # step 3: cek self.array[row][col] sebelum/sesudah harus kosong
-            if local_direct.up is not False and row + 1 < len(self.array) and self.array[row + 1][col] != self.empty_cell:
-                local_direct.down = None
-            if local_direct.down is not False and row > 0 and self.array[row - 1][col] != self.empty_cell:
-                local_direct.up = None
-            if local_direct.right is not False and col > 0 and self.array[row][col - 1] != self.empty_cell:
-                local_direct.left = None
-            if local_direct.left is not False and col + 1 < len(self.array[row]) and self.array[row][col + 1] != self.empty_cell:
-                local_direct.right = None
+            codeA, codeB = sideA.encode(), sideB.encode()
+            lenA, lenB = len(sideA), len(sideB)
+
+            # step 0: arah yang membuat papan melebihi :self.maxheight: /
+            # :self.maxwidth: (lihat :self.fits:) langsung ditolak tanpa
+            # mengecek huruf dan sisi kata
+            vfits = (height + max(0, lenA - (row - top)) + max(0, lenB - (bottom - row))) * 2 + 1 < maxheight
+            hfits = (width + max(0, lenA - (col - left)) + max(0, lenB - (right - col))) * 4 + 1 < maxwidth
+            if tracer is not None and not (vfits and hfits):
+                tracer.count("out_of_bounds", 2 - vfits - hfits)
+            if not (vfits or hfits):
+                if tracer is not None:
+                    tracer.count("candidates")
+                    tracer.count("rejected")
+                continue
+
+            # step 1: cek huruf yang sudah ada dan sisi kiri/kanan garis
+            # menurun ke atas (up) dan mendatar ke kiri (left)
+            up = down = 0 if vfits else None
+            left_ = right_ = 0 if hfits else None
+            for num in range(1, min(lenA, row - top) + 1 if vfits else 1):
+                offset = anchor - num * stride
+                if up is not None and cells[offset] and cells[offset] != codeA[-num]:
+                    up = None
+                if ul >= 0 or ur >= 0:
+                    crash = vcrash or vertical.get(row - num, 0) != nvertical
+                    if ul >= 0:
+                        if col > left and cells[offset - 1]:
+                            ul = -1 if crash or not ul else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            ul = 1
+                    if ur >= 0:
+                        if col < right and cells[offset + 1]:
+                            ur = -1 if crash or not ur else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            ur = 1
+            for num in range(1, min(lenA, col - left) + 1 if hfits else 1):
+                offset = anchor - num
+                if left_ is not None and cells[offset] and cells[offset] != codeA[-num]:
+                    left_ = None
+                if lu >= 0 or ld >= 0:
+                    crash = hcrash or horizontal.get(col - num, 0) != nhorizontal
+                    if lu >= 0:
+                        if row > top and cells[offset - stride]:
+                            lu = -1 if crash or not lu else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            lu = 1
+                    if ld >= 0:
+                        if row < bottom and cells[offset + stride]:
+                            ld = -1 if crash or not ld else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            ld = 1
+
+            # menurun ke bawah (down) dan mendatar ke kanan (right)
+            for num in range(1, min(lenB, bottom - row) + 1 if vfits else 1):
+                offset = anchor + num * stride
+                if down is not None and cells[offset] and cells[offset] != codeB[num - 1]:
+                    down = None
+                if dl >= 0 or dr >= 0:
+                    crash = vcrash or vertical.get(row + num, 0) != nvertical
+                    if dl >= 0:
+                        if col > left and cells[offset - 1]:
+                            dl = -1 if crash or not dl else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            dl = 1
+                    if dr >= 0:
+                        if col < right and cells[offset + 1]:
+                            dr = -1 if crash or not dr else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            dr = 1
+            for num in range(1, min(lenB, right - col) + 1 if hfits else 1):
+                offset = anchor + num
+                if right_ is not None and cells[offset] and cells[offset] != codeB[num - 1]:
+                    right_ = None
+                if ru >= 0 or rd >= 0:
+                    crash = hcrash or horizontal.get(col + num, 0) != nhorizontal
+                    if ru >= 0:
+                        if row > top and cells[offset - stride]:
+                            ru = -1 if crash or not ru else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            ru = 1
+                    if rd >= 0:
+                        if row < bottom and cells[offset + stride]:
+                            rd = -1 if crash or not rd else 0
+                            if tracer is not None:
+                                checks += 1
+                                crashed += crash
+                        else:
+                            rd = 1
+
+            # step 2: jumlah baris/kolom baru yang dibutuhkan
+            if up is not None:
+                up = max(0, lenA - (row - top))
+            if left_ is not None:
+                left_ = max(0, lenA - (col - left))
+            if down is not None:
+                down = max(0, lenB - (bottom - row))
+            if right_ is not None:
+                right_ = max(0, lenB - (right - col))
+
+            # step 3: cek sel sebelum/sesudah :location: harus kosong
+            if row < bottom and cells[anchor + stride]:
+                down = None
+            if row > top and cells[anchor - stride]:
+                up = None
+            if col > left and cells[anchor - 1]:
+                left_ = None
+            if col < right and cells[anchor + 1]:
+                right_ = None
 
             # step 4: cek sel setelah ujung kata harus kosong
             if sideA:
-                if isinstance(local_direct.up, int) and row - len(sideA) > 0 and self.array[row - len(sideA) - 1][col] != self.empty_cell:
-                    local_direct.up = None
-                if isinstance(local_direct.left, int) and col - len(sideA) > 0 and self.array[row][col - len(sideA) - 1] != self.empty_cell:
-                    local_direct.left = None
+                if up is not None and row - lenA > top and cells[anchor - (lenA + 1) * stride]:
+                    up = None
+                if left_ is not None and col - lenA > left and cells[anchor - lenA - 1]:
+                    left_ = None
             if sideB:
-                if isinstance(local_direct.down, int) and row + len(sideB) + 1 < len(self.array) and self.array[row + len(sideB) + 1][col] != self.empty_cell:
-                    local_direct.down = None
-                if isinstance(local_direct.right, int) and col + len(sideB) + 1 < len(self.array[row]) and self.array[row][col + len(sideB) + 1] != self.empty_cell:
-                    local_direct.right = None
+                if down is not None and row + lenB + 1 <= bottom and cells[anchor + (lenB + 1) * stride]:
+                    down = None
+                if right_ is not None and col + lenB + 1 <= right and cells[anchor + lenB + 1]:
+                    right_ = None
 
             # step 5: cek sekitar line
-            in_lines = Namespace(
-                up=(self.checkLines(lines.up.left, "up.left") and
-                    self.checkLines(lines.up.right, "up.right")
-                    and bool(sideA)) or not bool(sideA),
-                down=(self.checkLines(lines.down.left, "down.left") and
-                      self.checkLines(lines.down.right, "down.right") and bool(
-                    sideB)) or not bool(sideB),
-                left=(self.checkLines(lines.left.up, "left.up") and
-                      self.checkLines(lines.left.down, "left.down") and bool(
-                    sideA)) or not bool(sideA),
-                right=(self.checkLines(lines.right.up, "right.up") and
-                       self.checkLines(lines.right.down, "right.down") and bool(
-                    sideB)) or not bool(sideB)
-            )
-
-            logging.debug(f"{in_lines = }")
-            logging.debug(f"{local_direct = }")
-
-            # OK: parse final result
-            if (local_direct.left is not False and local_direct.right is not False) and \
-               (local_direct.left is not None and local_direct.right is not None) and \
-               (local_direct.left or not (local_direct.left and sideA)) and \
-               (in_lines.left and in_lines.right) and \
-               (local_direct.right or not (local_direct.right and sideB)):
-                results.append(Namespace(direction="horizontal", location=location, char=char, sideA=sideA, sideB=sideB,
-                                         newA=local_direct.left or 0, newB=local_direct.right or 0))
-
-            if (local_direct.up is not False and local_direct.down is not False) and \
-               (local_direct.up is not None and local_direct.down is not None) and \
-               (local_direct.up or not (local_direct.up and sideA)) and \
-               (in_lines.up and in_lines.down) and \
-               (local_direct.down or not (local_direct.down and sideB)):
-                results.append(Namespace(direction="vertical", location=location, char=char, sideA=sideA, sideB=sideB,
-                                         newA=local_direct.up or 0, newB=local_direct.down or 0))
-        if results and self.logging_level == logging.DEBUG:
-            logging.debug("results:")
-            pprint(results)
+            found = len(results)
+            if left_ is not None and right_ is not None and \
+               (not sideA or (lu >= 0 and ld >= 0)) and (not sideB or (ru >= 0 and rd >= 0)):
+                results.append(Placement("horizontal", location, char, sideA, sideB, left_, right_))
+            if up is not None and down is not None and \
+               (not sideA or (ul >= 0 and ur >= 0)) and (not sideB or (dl >= 0 and dr >= 0)):
+                results.append(Placement("vertical", location, char, sideA, sideB, up, down))
+
+            if tracer is not None:
+                tracer.count("candidates")
+                if found == len(results):
+                    tracer.count("rejected")
+                tracer.event("split", location=location, char=char, sideA=sideA, sideB=sideB,
+                             direct=(up, down, left_, right_), lines=(ul, ur, dl, dr, lu, ld, ru, rd))
+        if tracer is not None:
+            tracer.count("crash_checks", checks)
+            tracer.count("crashes", crashed)
+            if results:
+                tracer.event("results", word=word, results=results)
         return results
 
-    def parsePos(self, word: str, locations: List[tuple]) -> dict:
-        logging.debug(f"parsing kata: {word}")
+    def findAllDirections(self, word: str, locations: dict) -> List[Placement]:
+        """
+           Semua hasil :self.findPossibleDirection: untuk setiap posisi di
+           :locations: (lihat :self.find_position:) dengan urutan yang sama.
+           Memakai :self.findAllDirectionsNumpy: jika :self.vectorize: aktif.
+        """
+        vectorize = self.vectorize
+        if vectorize is None:
+            vectorize = numpy is not None and self.height * self.width >= VECTORIZE_MIN_AREA
+        if vectorize:
+            return self.findAllDirectionsNumpy(word, locations)
+        return [data for char, positions in locations.items()
+                for position in positions
+                for data in self.findPossibleDirection(word, char, position)]
+
+    def findAllDirectionsNumpy(self, word: str, locations: dict) -> List[Placement]:
+        """
+           Versi numpy dari :self.findAllDirections:, semua pasangan (posisi,
+           split) dievaluasi sekaligus. Sel di sepanjang kata (offset -L..L
+           dari :location:) diambil dari papan uint8 dengan margin kosong,
+           lalu aturan :self.findPossibleDirection: dicek dengan mask:
+             - sel kata harus kosong atau berisi huruf yang sama
+             - sel di sebelah :location: dan setelah ujung kata harus kosong
+             - garis samping tidak boleh diawali sel
+               terisi, berisi sel crash atau dua sel terisi berturut-turut.
+               Status garis pada versi skalar berlanjut antar split, jadi
+               garis bawah/kanan memakai panjang sideB dari split pertama
+               yang muat di dalam batas papan
+             - arah yang melebihi :self.maxheight:/:self.maxwidth: ditolak
+               sebelum semua pengecekan di atas
+        """
+        np = numpy
+        top, left, bottom, right = (self.bounds.top, self.bounds.left,
+                                    self.bounds.bottom, self.bounds.right)
+        length = len(word)
+        margin = length + 1
+        height, width = bottom - top + 1, right - left + 1
+
+        # papan seukuran :self.bounds: ditambah margin kosong, sehingga
+        # sel di luar papan selalu dianggap kosong seperti versi skalar
+        grid = self.grid
+        cells = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.stride)
+        board = np.zeros((height + 2 * margin, width + 2 * margin), dtype=np.uint8)
+        board[margin:margin + height, margin:margin + width] = cells[
+            top - grid.row0:bottom - grid.row0 + 1, left - grid.col0:right - grid.col0 + 1]
+
+        # lihat :self.findPossibleDirection:, crash per baris/kolom papan
+        def crashes(counter: dict, start: int, size: int, total: int):
+            counts = np.zeros(size + 2 * margin, dtype=np.int64)
+            for index, count in counter.items():
+                if -margin <= index - start < size + margin:
+                    counts[index - start + margin] = count
+            return counts != total
+        crash_rows = crashes(self.crash_index.vertical, top, height, len(self.placements.vertical))
+        crash_cols = crashes(self.crash_index.horizontal, left, width, len(self.placements.horizontal))
+
+        # satu baris untuk setiap (posisi, split), urut seperti versi skalar
+        rows, cols, index, sizes = [], [], [], []
+        for char, positions in locations.items():
+            occurrences = [num for num, letter in enumerate(word) if letter == char]
+            positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+            rows.append(np.repeat(positions[:, 0], len(occurrences)))
+            cols.append(np.repeat(positions[:, 1], len(occurrences)))
+            index.append(np.tile(occurrences, len(positions)))
+            sizes.append(np.full(len(positions), len(occurrences)))
+        if not rows:
+            return []
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        index, sizes = np.concatenate(index), np.concatenate(sizes)
+
+        # lihat step 0 :self.findPossibleDirection:, split pertama yang muat
+        # dicari per posisi (setiap posisi adalah satu blok baris berurutan)
+        after = length - 1 - index
+        vfits = (height + np.maximum(0, index - (rows - top)) +
+                 np.maximum(0, after - (bottom - rows))) * 2 + 1 < self.maxheight
+        hfits = (width + np.maximum(0, index - (cols - left)) +
+                 np.maximum(0, after - (right - cols))) * 4 + 1 < self.maxwidth
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+        vfirst = np.repeat(np.minimum.reduceat(np.where(vfits, index, length), starts), sizes)
+        hfirst = np.repeat(np.minimum.reduceat(np.where(hfits, index, length), starts), sizes)
+        if self.tracer is not None:
+            self.tracer.count("candidates", len(index))
+            self.tracer.count("out_of_bounds", int((~vfits).sum() + (~hfits).sum()))
+        keep = np.nonzero(vfits | hfits)[0]
+        total = len(index)
+        rows, cols, index, vfits, hfits, vfirst, hfirst = (
+            array[keep] for array in (rows, cols, index, vfits, hfits, vfirst, hfirst))
+        row, col = rows - top + margin, cols - left + margin
+
+        step = np.arange(-length, length + 1)
+        pos = index[:, None] + step
+        inword = (pos >= 0) & (pos < length)
+        expected = np.frombuffer(word.encode(), dtype=np.uint8)[np.clip(pos, 0, length - 1)]
+        must_empty = (np.abs(step) == 1) | (pos == -1) | (pos == length)
+        sideB = length - 1 - index
+        first_cell = np.abs(step) == 1
+
+        def line(first) -> "numpy.ndarray":
+            return ((step < 0) & (step >= -index[:, None])) | \
+                   ((step > 0) & (step <= np.where(sideB > 0, length - 1 - first, 0)[:, None]))
+
+        def valid(along, side1, side2, crash, lines, fits) -> "numpy.ndarray":
+            ok = ~(((along != 0) & ((inword & (along != expected)) | must_empty)).any(axis=1))
+            for side in (side1, side2):
+                filled = (side != 0) & lines
+                ok &= ~((filled & (crash | first_cell)).any(axis=1) |
+                        (filled[:, :-1] & filled[:, 1:]).any(axis=1))
+                if self.tracer is not None:
+                    filled &= fits[:, None]
+                    self.tracer.count("crash_checks", int(filled.sum()))
+                    self.tracer.count("crashes", int((filled & crash).sum()))
+            return fits & ok
+
+        rows_along, cols_along = row[:, None] + step, col[:, None] + step
+        horizontal = valid(board[row[:, None], cols_along], board[row[:, None] - 1, cols_along],
+                           board[row[:, None] + 1, cols_along],
+                           crash_rows[row][:, None] | crash_cols[cols_along], line(hfirst), hfits)
+        vertical = valid(board[rows_along, col[:, None]], board[rows_along, col[:, None] - 1],
+                         board[rows_along, col[:, None] + 1],
+                         crash_cols[col][:, None] | crash_rows[rows_along], line(vfirst), vfits)
+
+        if self.tracer is not None:
+            self.tracer.count("rejected", total - int((horizontal | vertical).sum()))
+
         results = []
-        for char, pos in locations.items():
-            for po in pos:
-                if (data_results := self.findPossibleDirection(word, char, po)):
-                    results.extend(data_results)
-                    logging.debug(
-                        f"\nterdapat {len(data_results)} kemungkinan untuk lokasi {po}\ntotal kemungkinan untuk kata {word!r}: {len(results)}\n")
-        return random.choice(results or [None])
-
-    def compute(self, loop=0, added=0) -> None:
-        temp = []
-        while self.words:
+        for num, direction in zip(*np.nonzero(np.stack([horizontal, vertical], axis=1))):
+            split, location = int(index[num]), (int(rows[num]), int(cols[num]))
+            if direction:
+                newA, newB = location[0] - top, bottom - location[0]
+            else:
+                newA, newB = location[1] - left, right - location[1]
+            results.append(Placement("vertical" if direction else "horizontal", location,
+                                     word[split], word[:split], word[split + 1:],
+                                     max(0, split - newA), max(0, length - 1 - split - newB)))
+        return results
+
+    def parsePos(self, word: str, locations: List[tuple]) -> dict:
+        results = self.findAllDirections(word, locations)
+        if self.tracer is not None:
+            self.tracer.event("parsePos", word=word, candidates=len(results))
+        return self.random.choice(results or [None])
+
+    def compute(self, *, cancel=None, progress: Optional[Callable] = None) -> Optional[bool]:
+        """
+           Menambahkan kata satu per satu (greedy) tanpa rekursi.
+
+           Kata yang dilewati tidak langsung diulang, kata tersebut menunggu
+           sampai ada kata baru yang ditambahkan dengan huruf yang sama (huruf
+           baru di papan, atau ruang baru di sekitar huruf yang sudah ada).
+           Kata yang "bangun" dicoba lagi di putaran berikutnya, paling banyak
+           :self.maxloop: kali per kata. :compute: berhenti jika tidak ada lagi
+           kata yang bisa dicoba.
+
+           :cancel: objek dengan method ``is_set()`` (misal threading.Event),
+           dicek sebelum setiap kata. Jika sudah di-set, :compute: berhenti
+           dan mengembalikan False, papan tetap valid dengan kata yang sudah
+           ditambahkan. :progress: dipanggil setelah setiap kata dengan
+           (kata terpasang, kata tersisa, putaran).
+        """
+        tracer = self.tracer
+        # huruf -> kata yang dilewati dan menunggu huruf tersebut, dict
+        # dipakai (bukan set) agar urutan kata tetap sama untuk :seed: yang sama
+        waiting = {}
+        # kata yang dilewati dan belum berhasil ditambahkan -> jumlah percobaan ulang
+        pending = {}
+        # kata yang sedang menunggu di :waiting: (belum dibangunkan)
+        sleeping = set()
+        ready = []
+        loop = added = placed = skipped = 0
+        while True:
+            if not self.words:
+                if tracer is not None:
+                    tracer.record_pass(loop, placed, skipped)
+                if not ready:
+                    break
+                self.words.extend(ready)
+                ready = []
+                loop += 1
+                placed = skipped = 0
+            if cancel is not None and cancel.is_set():
+                logging.info("dibatalkan setelah %s kata", added)
+                return False
             next_word = self.next_word(delitem=True)
-            pos = self.find_position(next_word)
-            if (data := self.parsePos(next_word, pos)):
+            if self.overlaps(next_word):
+                data = self.parsePos(next_word, self.find_position(next_word))
+            else:
+                data = None
+                self.mask_skipped += 1
+                if tracer is not None:
+                    tracer.count("mask_skipped")
+            # posisi dari :self.parsePos: selalu muat di dalam batas papan
+            if data and self.addWord(data):
                 added += 1
-                logging.info(
-                    f"menambahkan kata: {next_word!r} {data.location} arah {data.direction!r} {len(self.words)} kata tersisa [{len(self.array) * 2}, {len(self.array[0]) * 2}]")
-                if not self.addWord(data):
-                    temp = []
-                    break
+                placed += 1
+                logging.info("menambahkan kata: %r %s arah %r %s kata tersisa [%s, %s]",
+                             next_word, data.location, data.direction, len(self.words),
+                             self.height * 2, self.width * 2)
+                pending.pop(next_word, None)
+                if tracer is not None:
+                    tracer.count("placed")
+                # bangunkan kata yang menunggu salah satu huruf kata ini
+                for char in dict.fromkeys(next_word):
+                    for word in waiting.pop(char, ()):
+                        for other in dict.fromkeys(word):
+                            if other != char:
+                                waiting[other].pop(word, None)
+                        sleeping.discard(word)
+                        ready.append(word)
             else:
-                logging.info(f"lewati kata: {next_word}")
-                temp.append(next_word)
-        if temp:
-            if loop >= self.maxloop:
-                logging.info(
-                    f"\n{added} kata berhasil ditambahkan\n{len(temp)} kata tidak dapat ditambahkan {temp}")
-                return
-            self.words = set(temp)
-            self.compute(loop + 1, added)
+                logging.info("lewati kata: %s", next_word)
+                skipped += 1
+                retries = pending.setdefault(next_word, 0)
+                if retries < self.maxloop:
+                    pending[next_word] = retries + 1
+                    sleeping.add(next_word)
+                    for char in dict.fromkeys(next_word):
+                        waiting.setdefault(char, {})[next_word] = None
+                if tracer is not None:
+                    tracer.count("skipped")
+            if progress is not None:
+                progress(len(self.placements.vertical) + len(self.placements.horizontal),
+                         len(self.words) + len(ready) + len(sleeping), loop)
+        if pending:
+            logging.info("\n%s kata berhasil ditambahkan\n%s kata tidak dapat ditambahkan %s"
+                         "\n%s kali dilewati tanpa pencarian posisi (letter mask)",
+                         added, len(pending), list(pending), self.mask_skipped)
         else:
-            logging.info(f"\n{added} kata berhasil ditambahkan")
-
-    def refresh(self):
-        wordUse = self.word_used
-        lwordUse = len(wordUse)
-        prevarray = [self.array]
-
-        loop = 1
-        while loop:
-            self.__init__(wordUse, maxloop=self.maxloop, empty_cell=self.empty_cell, maxheight=self.maxheight, maxwidth=self.maxwidth)
-            self.compute()
-            if (len(self.word_used) == lwordUse and self.array != prevarray) or loop >= self.maxloop:
-                break
-            loop += 1
+            logging.info("\n%s kata berhasil ditambahkan\n%s kali dilewati tanpa pencarian posisi (letter mask)",
+                         added, self.mask_skipped)
 
-    def generateBoard(self) -> tuple:
+    def candidates(self, word: str) -> List[Namespace]:
+        """Semua posisi valid untuk :word: yang masih muat di dalam batas papan"""
+        if not self.overlaps(word):
+            return []
+        return self.findAllDirections(word, self.find_position(word))
+
+    def search(self, budget: float = 1.0, *, strategy: str = "lds", branching: int = 3) -> int:
+        """
+           Alternatif dari :self.compute: yang bisa membatalkan (backtrack)
+           kata yang sudah ditambahkan ketika kata berikutnya tidak bisa
+           ditempatkan.
+
+           Urutan kata sama dengan :self.compute:, kata yang dilewati diulang
+           (semuanya) sebanyak :self.maxloop: putaran. Setiap kata mencoba
+           paling banyak :branching: posisi acak ditambah pilihan "lewati".
+             - "dfs": depth-first search biasa
+             - "lds": limited discrepancy search, mulai dari 0 penyimpangan
+                      (satu kali greedy seperti :self.compute:) lalu terus
+                      ditambah sampai waktu habis
+
+           Berhenti setelah :budget: detik, papan diisi dengan susunan terbaik
+           (kata terbanyak) yang ditemukan. Mengembalikan jumlah kata terpakai.
+
+           Hasilnya biasanya lebih baik dari satu kali :self.compute:, tetapi
+           tidak lebih baik dari :self.compute: yang diulang dengan seed
+           berbeda dalam waktu yang sama (lihat :compute_best:), misal 150
+           kata di 60x160 dengan budget 2 detik: 131/134/144 kata, diulang
+           133/137/144 kata.
+        """
+        deadline = time.monotonic() + budget
+        words = list(self.words)
+        self.words = WordQueue(key=self.order)
+        total = len(words)
+        tracer = self.tracer
+        best = Namespace(placed=-1, path=[])
+
+        def options(word: str) -> List[Optional[Namespace]]:
+            if word in self.word_used:
+                return [None]
+            results = self.candidates(word)
+            self.random.shuffle(results)
+            return results[:branching] + [None]
+
+        def dfs(limit: float) -> Optional[bool]:
+            # setiap frame: kata ke-n dari :sequence:, pilihan yang sedang
+            # dipakai dan penyimpangan yang sudah terpakai sebelum frame ini
+            sequence = [(word, 0) for word in words]
+            stack = []
+            state = Namespace(placed=0, dead=0, limited=False)
+
+            def push(spent: int) -> None:
+                word, loop = sequence[len(stack)]
+                stack.append(Namespace(word=word, loop=loop, options=options(word), choice=-1,
+                                       applied=None, requeued=False, dead=False, spent=spent))
+
+            def undo(frame: Namespace) -> None:
+                if frame.applied is not None:
+                    self.removeWord(frame.applied)
+                    frame.applied = None
+                    state.placed -= 1
+                if frame.requeued:
+                    sequence.pop()
+                    frame.requeued = False
+                if frame.dead:
+                    state.dead -= 1
+                    frame.dead = False
+
+            if sequence:
+                push(0)
+            while stack:
+                if time.monotonic() > deadline:
+                    for frame in reversed(stack):
+                        undo(frame)
+                    return None
+                frame = stack[-1]
+                undo(frame)
+                frame.choice += 1
+                spent = frame.spent + (frame.choice > 0)
+                if frame.choice >= len(frame.options) or spent > limit:
+                    state.limited |= frame.choice < len(frame.options)
+                    stack.pop()
+                    if tracer is not None:
+                        tracer.count("backtracks")
+                    continue
+
+                option = frame.options[frame.choice]
+                if tracer is not None:
+                    tracer.count("search_nodes")
+                if option is not None:
+                    self.addWord(option)
+                    frame.applied = option
+                    state.placed += 1
+                elif frame.word not in self.word_used:
+                    # kata dilewati, ulangi di putaran berikutnya
+                    if frame.loop < self.maxloop:
+                        sequence.append((frame.word, frame.loop + 1))
+                        frame.requeued = True
+                    else:
+                        frame.dead = True
+                        state.dead += 1
+
+                if state.placed > best.placed:
+                    best.placed = state.placed
+                    best.path = [item.applied for item in stack if item.applied is not None]
+                    if best.placed == total:
+                        break
+                # kata yang tersisa tidak cukup untuk mengalahkan hasil terbaik
+                if total - state.dead <= best.placed or len(stack) == len(sequence):
+                    continue
+                push(spent)
+
+            for frame in reversed(stack):
+                undo(frame)
+            return state.limited
+
+        if strategy == "dfs":
+            dfs(float("inf"))
+        elif strategy == "lds":
+            for limit in itertools.count():
+                if not dfs(limit) or best.placed == total:
+                    break
+        else:
+            raise ValueError(f"strategy tidak dikenal: {strategy!r}")
+
+        for data in best.path:
+            self.addWord(data)
+        logging.info("\n%s kata berhasil ditambahkan (%s)", best.placed, strategy)
+        return len(self.word_used)
+
+    def score(self) -> tuple:
+        """
+           Nilai papan untuk membandingkan hasil: (jumlah kata, jumlah
+           persilangan, -luas papan). Semakin besar semakin baik.
+        """
+        letters = sum(len(word) for direction in ("vertical", "horizontal")
+                      for position, word in getattr(self.placements, direction))
+        return len(self.word_used), letters - len(self.grid), -(self.height * self.width)
+
+    def connected(self) -> bool:
+        """Apakah semua kata di papan saling terhubung lewat huruf yang dipakai bersama"""
+        words = [(direction, position, word) for direction in ("vertical", "horizontal")
+                 for position, word in getattr(self.placements, direction)]
+        owners = {}
+        for index, placement in enumerate(words):
+            for cell in self.word_cells(*placement):
+                owners.setdefault(cell, []).append(index)
+        seen, stack = {0}, [0]
+        while stack:
+            for cell in self.word_cells(*words[stack.pop()]):
+                for other in owners[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+        return len(seen) >= len(words)
+
+    def optimize(self, budget: float = 1.0, *, size: int = 3, tries: int = 32) -> tuple:
+        """
+           Memperbaiki susunan yang sudah ada (local search) sampai :budget:
+           detik habis, papan tidak dibuat ulang dari awal.
+
+           Setiap langkah menghapus 1 sampai :size: kata acak, lalu mencoba
+           menambahkan kembali kata tersebut ditambah paling banyak :tries:
+           kata yang belum terpakai. Perubahan disimpan jika :self.score:
+           lebih baik, jika tidak papan dikembalikan seperti semula. Langkah
+           yang membuat papan terpisah langsung dibatalkan.
+           Mengembalikan :self.score: terbaik.
+        """
+        deadline = time.monotonic() + budget
+        tracer = self.tracer
+        words = list(self.letter_masks)
+        best = self.score()
+        while time.monotonic() < deadline:
+            placed = [(direction, position, word) for direction in ("vertical", "horizontal")
+                      for position, word in getattr(self.placements, direction)]
+            if len(placed) < 2:
+                break
+            removed = self.random.sample(placed, self.random.randint(1, min(size, len(placed) - 1)))
+            for direction, position, word in removed:
+                self.removeWord(Placement(direction, position, word[0], "", word[1:], 0, 0))
+            added = []
+            if self.connected():
+                leftovers = [word for word in words if word not in self.word_used]
+                leftovers = self.random.sample(leftovers, min(tries + len(removed), len(leftovers)))
+                for word in [word for _, _, word in removed] + leftovers:
+                    if word not in self.word_used and (options := self.candidates(word)):
+                        data = self.random.choice(options)
+                        self.addWord(data)
+                        added.append(data)
+            if tracer is not None:
+                tracer.count("optimize_moves")
+            if added and (score := self.score()) > best:
+                best = score
+                if tracer is not None:
+                    tracer.count("optimize_accepted")
+                continue
+            for data in reversed(added):
+                self.removeWord(data)
+            for direction, position, word in reversed(removed):
+                self.placeWord(direction, position, word)
+        logging.info("optimize: %s kata, %s persilangan, luas %s", best[0], best[1], -best[2])
+        return best
+
+    def refresh(self, budget: float = 1.0) -> tuple:
+        """Memperbaiki papan yang sudah ada, lihat :self.optimize:"""
+        return self.optimize(budget)
+
+    def generateBoard(self, *, views: tuple = ("board", "clueless")) -> tuple:
         gridMaker = GridMaker(self.array, self.registered)
-        gridMaker.generate()
+        gridMaker.generate(views=views)
         return gridMaker
 
-if __name__ == "__main__":
+    def streamBoard(self, file=None, *, view: str = "board") -> None:
+        """Menulis papan baris per baris ke :file: (default stdout), lihat :GridMaker.stream:"""
+        file = file or sys.stdout
+        for line in GridMaker(self.iterarray(), self.registered).stream(view):
+            file.write(line + "\n")
+
+def random_words(rng: random.Random, *, minlen: int = 2, maxlen: int = 3, mincount: int = 10, maxcount: int = 50) -> List[str]:
+    """Membuat daftar kata acak (seperti yang dipakai oleh CrosswordTui)"""
+    return ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(
+        rng.randrange(minlen, maxlen + 1))) for _ in range(rng.randrange(mincount, maxcount))]
+
+# naikkan setiap kali hasil compute/generate berubah untuk input yang sama,
+# versi ini bagian dari key :crosswordCache.LayoutCache:
+ENGINE_VERSION = 4
+
+# satu :crosswordCache.LayoutCache: per path untuk setiap proses
+_layout_caches = {}
+
+def _layout_cache(path: Optional[str]) -> Optional[crosswordCache.LayoutCache]:
+    if not path:
+        return None
+    if path not in _layout_caches:
+        _layout_caches[path] = crosswordCache.LayoutCache(path)
+    return _layout_caches[path]
+
+def _layout_key(source: str, words: List[str], job: dict) -> str:
+    """Key cache dari kata (sudah dinormalisasi), batas papan, seed dan versi engine"""
+    return crosswordCache.layout_key(source, normalize_words(words), job["maxheight"], job["maxwidth"],
+                                     job["seed"], ENGINE_VERSION, repr(job["options"]))
+
+def _layout(engine: crosswordEngine) -> dict:
+    """array, registered dan new_position dari :engine: yang sudah di-compute"""
+    return {
+        "array": engine.array,
+        "registered": vars(engine.registered),
+        "new_position": engine.generateBoard(views=("board",)).new_position,
+    }
+
+def _cached_layout(cache: Optional[crosswordCache.LayoutCache], key: Optional[str], build: Callable) -> Optional[dict]:
+    """
+       :_layout: dari cache, atau dari :build: (fungsi yang mengembalikan
+       engine yang sudah di-compute, None jika dibatalkan) lalu disimpan.
+       Baris array disimpan sebagai string agar ringkas.
+    """
+    if cache is not None and (layout := cache.get(key)):
+        layout["array"] = [list(row) for row in layout["array"]]
+        return layout
+    if (engine := build()) is None:
+        return None
+    layout = _layout(engine)
+    if cache is not None:
+        cache.put(key, dict(layout, array=["".join(row) for row in layout["array"]]))
+    return layout
+
+def _generate_job(job: dict) -> dict:
+    """Worker untuk :generate_many:, dijalankan di dalam proses terpisah"""
+    rng = random.Random(job["seed"])
+    words = job["words"] or random_words(rng)
+    cache = _layout_cache(job["cache"])
+    key = _layout_key("words" if job["words"] else "random", words, job) if cache is not None else None
+
+    def build() -> crosswordEngine:
+        engine = crosswordEngine(words, maxheight=job["maxheight"], maxwidth=job["maxwidth"],
+                                 seed=rng, **job["options"])
+        engine.compute()
+        return engine
+
+    return {
+        "index": job["index"],
+        "seed": job["seed"],
+        **_cached_layout(cache, key, build),
+    }
+
+def generate_many(jobs, *, maxheight: Optional[int] = None, maxwidth: Optional[int] = None, seed: int = 0, processes: Optional[int] = None, maxpending: Optional[int] = None, cache: Optional[str] = None, **options):
+    """
+       Membuat banyak teka-teki sekaligus menggunakan process pool.
+
+       Setiap item di :jobs: bisa berupa:
+         - list kata
+         - int, dipakai sebagai seed untuk membuat kata acak (:random_words:)
+         - dict dengan key "words", "seed", "maxheight" dan/atau "maxwidth"
+
+       Job tanpa seed memakai ``seed + index``, jadi hasilnya selalu sama
+       untuk input yang sama. Hasil dikembalikan (yield) sesuai urutan selesai,
+       gunakan key "index" untuk mencocokkan dengan job aslinya. :jobs: dibaca
+       secara bertahap dan paling banyak :maxpending: job yang ditampung
+       sehingga memori tetap terbatas walaupun jumlah job sangat banyak.
+
+       :cache: path :crosswordCache.LayoutCache:, job yang sudah pernah
+       dibuat (kata, ukuran, seed dan opsi yang sama) tidak di-compute ulang.
+    """
+    processes = processes or os.cpu_count() or 1
+    maxpending = maxpending or processes * 2
+
+    def parse(index: int, job) -> dict:
+        if isinstance(job, int):
+            job = {"seed": job}
+        elif not isinstance(job, dict):
+            job = {"words": list(job)}
+        return {
+            "index": index,
+            "words": job.get("words"),
+            "seed": job.get("seed", seed + index),
+            "maxheight": job.get("maxheight", maxheight),
+            "maxwidth": job.get("maxwidth", maxwidth),
+            "cache": cache,
+            "options": options,
+        }
+
+    jobs = (parse(index, job) for index, job in enumerate(jobs))
+    with ProcessPoolExecutor(processes) as executor:
+        pending = set()
+        for job in jobs:
+            if len(pending) >= maxpending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+            pending.add(executor.submit(_generate_job, job))
+        for future in as_completed(pending):
+            yield future.result()
+
+# di-set oleh :_init_board: di setiap worker :BoardPool:
+_board_state = None
+
+def _init_board(generation, progress) -> None:
+    global _board_state
+    # progress boleh hilang, worker tidak perlu menunggu queue dibaca saat selesai
+    progress.cancel_join_thread()
+    _board_state = Namespace(generation=generation, progress=progress, dictionary=None)
+
+class _StaleBoard:
+    """Token pembatalan :_board_job:, aktif jika ukuran :BoardPool: sudah berubah"""
+    def __init__(self, generation: int):
+        self.generation = generation
+
+    def is_set(self) -> bool:
+        return _board_state.generation.value != self.generation
+
+def _board_job(job: dict) -> Optional[dict]:
+    """Worker untuk :BoardPool:, papan siap tampil dari kata acak"""
+    cancel = _StaleBoard(job["generation"])
+    if cancel.is_set():
+        return None
+
+    def progress(placed: int, remaining: int, loop: int) -> None:
+        _board_state.progress.put((job["generation"], placed, remaining, loop))
+
+    rng = random.Random(job["seed"])
+    if job["dictionary"]:
+        # index dibuka sekali per worker, lihat :crosswordDict.WordIndex:
+        if _board_state.dictionary is None:
+            _board_state.dictionary = crosswordDict.load(job["dictionary"])
+        words = _board_state.dictionary.sample(rng.randrange(10, 50), rng, maxlen=job["maxlen"])
+    else:
+        words = random_words(rng)
+    cache = _layout_cache(job["cache"])
+    key = _layout_key("board", words, job) if cache is not None else None
+
+    def build() -> Optional[crosswordEngine]:
+        engine = crosswordEngine(words, maxheight=job["maxheight"],
+                                 maxwidth=job["maxwidth"], seed=rng, **job["options"])
+        if engine.compute(cancel=cancel, progress=progress) is False:
+            return None
+        return engine
+
+    if (layout := _cached_layout(cache, key, build)) is None:
+        return None
+    gridMaker = GridMaker(layout["array"], Namespace(**layout["registered"]))
+    gridMaker.generate()
+    return {
+        "seed": job["seed"],
+        "board": gridMaker.board,
+        "clueless": gridMaker.clueless,
+        "new_position": gridMaker.new_position,
+        "height": job["maxheight"],
+        "width": job["maxwidth"],
+    }
+
+class BoardPool:
+    """
+       Menyiapkan papan dari kata acak (lihat :random_words:) di process pool
+       untuk satu ukuran (maxheight, maxwidth), paling banyak :maxsize: papan
+       disiapkan sekaligus.
+
+       :self.get: mengambil papan yang sudah jadi tanpa menunggu dan langsung
+       menyiapkan penggantinya. Jika ukuran berubah (:self.resize:) semua
+       papan untuk ukuran lama dibuang dan :crosswordEngine.compute: yang
+       masih berjalan untuk ukuran lama langsung dihentikan.
+       :self.progress: progress papan yang sedang dibuat.
+
+       :dictionary: file kata / index (lihat :crosswordDict.load:), kata
+       diambil secara acak dengan panjang maksimal :maxlen:. :cache: path
+       :crosswordCache.LayoutCache:, lihat :generate_many:
+    """
+    def __init__(self, *, maxsize: int = 2, processes: int = 1, seed: Union[int, random.Random, None] = None, dictionary: Optional[str] = None, maxlen: Optional[int] = 6, cache: Optional[str] = None, **options):
+        self.random = seed if isinstance(seed, random.Random) else random.Random(seed)
+        self.maxsize = maxsize
+        self.dictionary = dictionary
+        self.maxlen = maxlen
+        self.cache = cache
+        self.options = options
+        self.size = None
+        self.futures = []
+        self.generation = multiprocessing.Value("i", 0)
+        self.queue = multiprocessing.Queue()
+        self.last_progress = None
+        self.executor = ProcessPoolExecutor(processes, initializer=_init_board,
+                                            initargs=(self.generation, self.queue))
+
+    def resize(self, maxheight: int, maxwidth: int) -> None:
+        if (maxheight, maxwidth) == self.size:
+            return
+        for future in self.futures:
+            future.cancel()
+        self.futures = []
+        self.size = (maxheight, maxwidth)
+        self.generation.value += 1
+        self.last_progress = None
+        self.refill()
+
+    def refill(self) -> None:
+        maxheight, maxwidth = self.size
+        while len(self.futures) < self.maxsize:
+            self.futures.append(self.executor.submit(_board_job, {
+                "seed": self.random.getrandbits(32), "maxheight": maxheight,
+                "maxwidth": maxwidth, "generation": self.generation.value,
+                "dictionary": self.dictionary, "maxlen": self.maxlen, "cache": self.cache,
+                "options": self.options,
+            }))
+
+    def progress(self) -> Optional[tuple]:
+        """(kata terpasang, kata tersisa, putaran) terakhir untuk ukuran sekarang"""
+        while True:
+            try:
+                generation, *progress = self.queue.get_nowait()
+            except queue.Empty:
+                return self.last_progress
+            if generation == self.generation.value:
+                self.last_progress = tuple(progress)
+
+    def ready(self) -> int:
+        """Jumlah papan yang sudah jadi"""
+        return sum(future.done() for future in self.futures)
+
+    def get(self, timeout: Optional[float] = 0) -> Optional[dict]:
+        """
+           Papan yang sudah jadi (urutan selesai), None jika belum ada
+           dalam :timeout: detik (None berarti tunggu sampai ada)
+        """
+        if not self.futures:
+            return None
+        done, _ = wait(self.futures, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            return None
+        future = next(future for future in self.futures if future in done)
+        self.futures.remove(future)
+        self.refill()
+        return future.result()
+
+    def close(self) -> None:
+        # job yang sedang berjalan berhenti sendiri (lihat :_StaleBoard:), jadi
+        # shutdown bisa menunggu worker selesai sebelum queue ditutup
+        self.generation.value += 1
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.queue.close()
+        self.queue.join_thread()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+# di-set oleh worker :compute_best: jika target sudah tercapai
+_stop_event = None
+
+def _init_attempt(event) -> None:
+    global _stop_event
+    _stop_event = event
+
+def _attempt(job: dict) -> Optional[tuple]:
+    """Worker untuk :compute_best:, satu kali :crosswordEngine.compute: dengan seed sendiri"""
+    if _stop_event.is_set() or time.time() > job["deadline"]:
+        return None
+    engine = crosswordEngine(job["words"], seed=job["seed"], **job["options"])
+    if engine.compute(cancel=_stop_event) is False:
+        return None
+    score = engine.score()
+    if score[0] >= job["target"]:
+        _stop_event.set()
+    return score, job["seed"], engine
+
+def compute_best(words: List[str], *, attempts: int = 8, processes: Optional[int] = None, timeout: Optional[float] = None, target: Optional[float] = None, seed: int = 0, **options) -> Optional[crosswordEngine]:
+    """
+       Menjalankan :attempts: kali :crosswordEngine.compute: dengan seed
+       berbeda (``seed + n``) secara paralel dan mengembalikan engine dengan
+       :crosswordEngine.score: terbaik (kata terbanyak, persilangan terbanyak,
+       papan terkecil). :options: diteruskan ke :crosswordEngine:.
+
+       :timeout: batas waktu (detik) untuk semua percobaan, percobaan yang
+       belum dimulai akan dibatalkan. :target: rasio kata yang harus terpakai
+       (misal 1.0 = semua kata), jika sudah tercapai percobaan lain berhenti.
+       Selalu menunggu minimal satu percobaan selesai.
+    """
+    deadline = time.time() + timeout if timeout is not None else float("inf")
+    total = len(normalize_words(words))
+    target = total * target if target is not None else float("inf")
+    event = multiprocessing.Event()
+    executor = ProcessPoolExecutor(processes, initializer=_init_attempt, initargs=(event,))
+    pending = {executor.submit(_attempt, {
+        "words": words, "seed": seed + attempt, "deadline": deadline,
+        "target": target, "options": options,
+    }) for attempt in range(attempts)}
+    best = None
+    try:
+        while pending and not (best and best[0][0] >= target):
+            remaining = None
+            if best and timeout is not None:
+                remaining = max(0, deadline - time.time())
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                if (result := future.result()) and (best is None or result[:2] > best[:2]):
+                    best = result
+    finally:
+        event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+    if best is None:
+        return None
+    score, winner, engine = best
+    logging.info("hasil terbaik seed %s: %s kata, %s persilangan, luas %s",
+                 winner, score[0], score[1], -score[2])
+    return engine
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="crossword generator")
+    parser.add_argument("words", nargs="*")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="satu daftar kata per baris ('-' untuk stdin), hasil ditulis sebagai JSON lines")
+    parser.add_argument("--seeds", type=int, metavar="N",
+                        help="buat N teka-teki dari kata acak (seed 0..N-1 + --seed)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--jobs", type=int, help="jumlah proses (default: jumlah cpu)")
+    parser.add_argument("--cache", metavar="FILE", help="cache susunan papan (sqlite) untuk --batch/--seeds")
+    parser.add_argument("--maxheight", type=int)
+    parser.add_argument("--maxwidth", type=int)
+    parser.add_argument("--output", metavar="FILE",
+                        help="tulis papan baris per baris ke FILE ('-' untuk stdout), untuk papan besar")
+    parser.add_argument("--clueless", action="store_true", help="papan tanpa jawaban (dengan --output)")
+    parser.add_argument("--dict", metavar="FILE",
+                        help="ambil kata acak dari kamus (file teks atau index, lihat crosswordDict)")
+    parser.add_argument("--count", type=int, default=50, help="jumlah kata dari --dict")
+    parser.add_argument("--maxlen", type=int, help="panjang kata maksimal dari --dict")
+    parser.add_argument("--optimize", type=float, default=0, metavar="SECONDS",
+                        help="perbaiki papan setelah compute selama SECONDS detik")
+    args = parser.parse_args(argv)
+
+    if args.dict:
+        with crosswordDict.load(args.dict) as index:
+            args.words += index.sample(args.count, random.Random(args.seed), maxlen=args.maxlen)
+
+    if args.batch or args.seeds:
+        batch = args.batch and args.batch != "-"
+        with open(args.batch) if batch else contextlib.nullcontext(sys.stdin) as stream:
+            if args.batch:
+                jobs = (line.split() for line in stream if line.strip())
+            else:
+                jobs = (args.seed + index for index in range(args.seeds))
+            for result in generate_many(jobs, maxheight=args.maxheight, maxwidth=args.maxwidth,
+                                        seed=args.seed, processes=args.jobs, cache=args.cache):
+                print(json.dumps(result), flush=True)
+        return
+
+    if args.output:
+        c = crosswordEngine(args.words, maxheight=args.maxheight, maxwidth=args.maxwidth, seed=args.seed)
+        c.compute()
+        if args.optimize:
+            c.optimize(args.optimize)
+        view = "clueless" if args.clueless else "board"
+        if args.output == "-":
+            c.streamBoard(sys.stdout, view=view)
+        else:
+            with open(args.output, "w") as file:
+                c.streamBoard(file, view=view)
+        return
+
     from cmd2 import ansi
     import shutil
     term = shutil.get_terminal_size()
     c = crosswordEngine(
-        sys.argv[1:], maxheight=term.lines, maxwidth=term.columns)
+        args.words, maxheight=args.maxheight or term.lines, maxwidth=args.maxwidth or term.columns)
     try:
         c.compute()
+        if args.optimize:
+            c.optimize(args.optimize)
     except KeyboardInterrupt:
         pass
     g = c.generateBoard()
@@ -764,3 +2017,6 @@ if __name__ == "__main__":
     print (p.start)
     p.locaround
     print (g.clueless)
+
+if __name__ == "__main__":
+    main()
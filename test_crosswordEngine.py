@@ -0,0 +1,57 @@
+"""
+   python -m pytest test_crosswordEngine.py
+"""
+import random
+
+import pytest
+
+import crosswordEngine as engineModule
+from crosswordEngine import GridMaker, crosswordEngine, normalize_words, random_words
+
+SEEDS = range(20)
+
+
+def computed_board(seed: int) -> tuple:
+    """Papan hasil :crosswordEngine.compute: dan random untuk kata uji"""
+    rng = random.Random(seed)
+    words = random_words(rng, mincount=50, maxcount=300, minlen=2, maxlen=rng.choice([4, 7, 10]))
+    engine = crosswordEngine(words, maxheight=rng.choice([15, 25, 40]),
+                             maxwidth=rng.choice([30, 60, 100]), seed=seed)
+    engine.compute()
+    return engine, rng
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_find_all_directions_numpy_matches_scalar(seed):
+    pytest.importorskip("numpy")
+    assert engineModule.numpy is not None
+    engine, rng = computed_board(seed)
+    # kata acak (termasuk kata yang sudah terpakai) dengan alfabet kecil
+    # supaya banyak huruf yang sama dengan papan
+    probe = ["".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ"[:rng.randrange(3, 26)])
+                     for _ in range(rng.randrange(2, 12))) for _ in range(80)]
+    for word in normalize_words(probe + sorted(engine.word_used)):
+        locations = engine.find_position(word)
+        engine.vectorize = False
+        scalar = engine.findAllDirections(word, locations)
+        engine.vectorize = True
+        vectorized = engine.findAllDirections(word, locations)
+        assert vectorized == scalar, word
+        assert all(engine.fits(data) for data in scalar)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_render_matches_legacy(seed):
+    engine, _ = computed_board(seed)
+    legacy = GridMaker(engine.array, engine.registered)
+    legacy.generate(legacy=True)
+    gridMaker = engine.generateBoard()
+    assert gridMaker.serialize() == legacy.serialize()
+    assert gridMaker.serialize(gridMaker.clueless) == legacy.serialize(legacy.clueless)
+    assert gridMaker.new_position == legacy.new_position
+
+    clueless = engine.generateBoard(views=("clueless",))
+    assert clueless.serialize(clueless.clueless) == legacy.serialize(legacy.clueless)
+    for view, arrays in (("board", legacy.board), ("clueless", legacy.clueless)):
+        stream = GridMaker(engine.iterarray(), engine.registered).stream(view)
+        assert list(stream) == legacy.serialize(arrays)